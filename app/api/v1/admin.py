@@ -2,9 +2,13 @@
 
 from fastapi import APIRouter, HTTPException, Depends
 from app.services.admin_manager import (
-    update_system_config, get_system_logs, clear_logs, set_user_permission, remove_user, get_users_list
+    update_system_config, get_system_config, get_system_logs, clear_logs, set_user_permission, remove_user, get_users_list
 )
 from app.core.database import get_database
+from app.core.hashing import password_hasher
+from app.core.redis_pool import redis_pool
+from app.services.logging_service import log_sink
+from app.services.intent_resolver import intent_resolver
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
@@ -24,17 +28,21 @@ async def get_system_status(db: AsyncIOMotorDatabase = Depends(get_database)):
     status = {
         "database": db_status,
         "ai_optimizer": "Ativo",
-        "logs_service": "Ativo",
+        "logs_service": "Ativo" if log_sink.running else "Inativo",
+        "logs_buffer": log_sink.stats(),
+        "password_hashing": password_hasher.stats(),
+        "redis_pool": redis_pool.stats(),
+        "intent_resolution": intent_resolver.stats(),
         "api_version": "1.20"
     }
     return {"system_status": status}
 
 @router.get("/configurations")
-async def get_system_configurations(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_system_configurations():
     """
     Obtém as configurações atuais do sistema.
     """
-    config = await db["system_config"].find_one({}, {"_id": 0})
+    config = await get_system_config()
     if not config:
         raise HTTPException(status_code=404, detail="Nenhuma configuração encontrada.")
 
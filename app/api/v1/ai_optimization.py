@@ -1,9 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.services.ai_optimizer import analyze_system, apply_optimization, revert_optimization
 from app.core.database import get_database
+from app.core.pagination import paginate
+from app.services.counters import get_counts
+from app.services.module_repository import get_module_by_name
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
+from typing import Optional
 
 router = APIRouter()
 
@@ -14,7 +18,7 @@ async def get_optimization_status(db: AsyncIOMotorDatabase = Depends(get_databas
     """
     try:
         last_analysis = await db["ai_optimizations"].find_one(sort=[("timestamp", -1)])
-        pending_count = await db["ai_optimizations"].count_documents({"status": "pending"})
+        pending_count = (await get_counts("pending_optimizations"))["pending_optimizations"]
 
         status = {
             "ai_optimizer_active": True,
@@ -45,7 +49,7 @@ async def apply_ai_optimization(module_name: str, db: AsyncIOMotorDatabase = Dep
         if not module_name:
             raise HTTPException(status_code=400, detail="O nome do módulo não pode estar vazio.")
 
-        module = await db["modules"].find_one({"name": module_name})
+        module = await get_module_by_name(module_name)
         if not module:
             raise HTTPException(status_code=404, detail=f"Módulo '{module_name}' não encontrado.")
 
@@ -55,15 +59,17 @@ async def apply_ai_optimization(module_name: str, db: AsyncIOMotorDatabase = Dep
         raise HTTPException(status_code=500, detail=f"Erro ao aplicar otimização: {str(e)}")
 
 @router.get("/history")
-async def get_optimization_history(limit: int = 50, db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_optimization_history(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Retorna o histórico de otimizações aplicadas pela IA, limitando a quantidade retornada.
+    Retorna o histórico de otimizações aplicadas pela IA, paginado por cursor.
     """
     try:
-        history = await db["ai_optimizations"].find().sort("timestamp", -1).to_list(length=limit)
-        if not history:
+        page = await paginate(db["ai_optimizations"], limit=limit, cursor=cursor)
+        if not page["items"] and not cursor:
             return {"message": "Nenhuma otimização foi registrada ainda."}
-        return {"history": history}
+        return {"history": page["items"], "next_cursor": page["next_cursor"]}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao recuperar histórico de otimizações: {str(e)}")
 
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.services.chat_assistant import process_chat_request, create_module, improve_module, fetch_ai_suggestions
+from app.services.chat_assistant import process_chat_request, stream_chat_request, create_module, improve_module, fetch_ai_suggestions
+from app.core.sse import sse_response
+from app.services.session_context import resolve_session_id
+from app.services.chat_search import search_chat_history
 from app.core.database import get_database
+from app.core.pagination import paginate
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 router = APIRouter()
 
 @router.post("/message")
-async def chat_with_ai(request: Dict[str, Any], db: AsyncIOMotorDatabase = Depends(get_database)):
+async def chat_with_ai(request: Dict[str, Any]):
     """
     Envia uma mensagem para a IA e recebe uma resposta inteligente baseada no aprendizado contínuo.
     """
@@ -17,31 +20,53 @@ async def chat_with_ai(request: Dict[str, Any], db: AsyncIOMotorDatabase = Depen
         if not user_message:
             raise HTTPException(status_code=400, detail="A mensagem não pode estar vazia.")
 
-        response = await process_chat_request(db, user_message)
+        # O histórico do turno é gravado por `process_chat_request`
+        session_id = resolve_session_id(request.get("session_id"))
+        response = await process_chat_request(user_message, session_id)
 
-        # Salvar no histórico do chat
-        chat_log = {
-            "timestamp": datetime.utcnow(),
-            "user_message": user_message,
-            "ai_response": response
-        }
-        await db["chat_history"].insert_one(chat_log)
-
-        return {"response": response}
+        return {"response": response, "session_id": session_id}
     except Exception as e:
         return {"error": f"Erro no processamento do chat: {str(e)}"}
 
+@router.post("/message/stream")
+async def chat_with_ai_stream(request: Dict[str, Any]):
+    """
+    Envia uma mensagem para a IA e recebe a resposta via Server-Sent Events, à medida que é gerada.
+    O histórico do chat é gravado ao final do stream.
+    """
+    user_message = request.get("message", "").strip()
+    if not user_message:
+        raise HTTPException(status_code=400, detail="A mensagem não pode estar vazia.")
+
+    session_id = resolve_session_id(request.get("session_id"))
+    return sse_response(stream_chat_request(user_message, session_id))
+
 @router.get("/history")
-async def get_chat_history(limit: int = 50, db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_chat_history(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Retorna o histórico de interações do Admin com o Chat Central.
+    Retorna o histórico de interações do Admin com o Chat Central, paginado por cursor.
     """
     try:
-        chat_logs = await db["chat_history"].find().sort("timestamp", -1).limit(limit).to_list(length=limit)
-        return {"history": chat_logs if chat_logs else "Nenhum histórico encontrado."}
+        page = await paginate(db["chat_history"], limit=limit, cursor=cursor)
+        chat_logs = page["items"]
+        return {"history": chat_logs if chat_logs else "Nenhum histórico encontrado.", "next_cursor": page["next_cursor"]}
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": f"Erro ao recuperar histórico do chat: {str(e)}"}
 
+@router.get("/search")
+async def search_chat(q: str, limit: int = 20):
+    """
+    Busca no histórico do chat por relevância (BM25) em mensagens do Admin e respostas da IA.
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="A consulta não pode estar vazia.")
+    try:
+        return await search_chat_history(q, limit)
+    except Exception as e:
+        return {"error": f"Erro ao buscar no histórico do chat: {str(e)}"}
+
 @router.post("/create-module")
 async def create_internal_module(request: Dict[str, Any], db: AsyncIOMotorDatabase = Depends(get_database)):
     """
@@ -3,9 +3,11 @@ from app.services.deploy_manager import (
     start_deploy, cancel_deploy, rollback_deploy, get_deploy_status, log_deploy_action
 )
 from app.core.database import get_database
+from app.core.pagination import paginate
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
+from typing import Optional
 
 router = APIRouter()
 
@@ -75,9 +77,9 @@ async def rollback_to_previous_version(deploy_id: str, db: AsyncIOMotorDatabase
     return {"message": f"Deploy '{deploy_id}' revertido com sucesso!", "details": result}
 
 @router.get("/history")
-async def get_deploy_history(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_deploy_history(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Retorna o histórico de deploys realizados, ordenado por data.
+    Retorna o histórico de deploys realizados, ordenado por data e paginado por cursor.
     """
-    history = await db["deploys"].find().sort("timestamp", -1).to_list(length=50)
-    return {"deploy_history": history}
+    page = await paginate(db["deploys"], limit=limit, cursor=cursor)
+    return {"deploy_history": page["items"], "next_cursor": page["next_cursor"]}
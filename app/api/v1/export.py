@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from app.core.database import get_database
+from app.core.security import admin_required
+from app.services.export_service import EXPORTABLE_COLLECTIONS, EXPORT_BATCH_SIZE, stream_ndjson
+from app.services.log_query import build_log_query
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from datetime import datetime
+from typing import Optional
+
+router = APIRouter()
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: str,
+    log_type: Optional[str] = Query(None, description="Filtrar por tipo (info, warning, error)"),
+    start_date: Optional[str] = Query(None, description="Exportar a partir desta data (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Exportar até esta data (YYYY-MM-DD)"),
+    gzip: bool = Query(False, description="Comprimir a exportação em gzip"),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, description="Documentos lidos e enviados por lote"),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user=Depends(admin_required)
+):
+    """
+    Exporta logs, histórico do chat, decisões da IA ou logs da API em NDJSON via streaming,
+    com os mesmos filtros de `/logs/`.
+    """
+    if collection not in EXPORTABLE_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Coleção '{collection}' não pode ser exportada.")
+
+    try:
+        query = build_log_query(log_type, start_date, end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Data inválida. Use o formato YYYY-MM-DD.")
+
+    filename = f"{collection}-{datetime.utcnow():%Y%m%d%H%M%S}.ndjson"
+    media_type = "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_ndjson(db, collection, query, batch_size=batch_size, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.services.frontend_sync_manager import sync_frontend, detect_frontend_changes, revert_sync, get_sync_status, generate_full_frontend_json
 from app.core.database import get_database
+from app.core.pagination import paginate
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
+from typing import Optional
 
 router = APIRouter()
 
@@ -35,12 +37,12 @@ async def get_frontend_changes(db: AsyncIOMotorDatabase = Depends(get_database))
     return {"pending_changes": changes}
 
 @router.get("/history")
-async def get_sync_history(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_sync_history(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Retorna o histórico de sincronizações realizadas.
+    Retorna o histórico de sincronizações realizadas, paginado por cursor.
     """
-    history = await db["frontend_sync"].find().sort("timestamp", -1).to_list(length=50)
-    return {"sync_history": history}
+    page = await paginate(db["frontend_sync"], limit=limit, cursor=cursor)
+    return {"sync_history": page["items"], "next_cursor": page["next_cursor"]}
 
 @router.delete("/revert/{sync_id}")
 async def revert_frontend_sync(sync_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -1,5 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from app.core.database import get_database
+from app.core.pagination import paginate
+from app.services.log_query import build_log_query, parse_date
+from app.services.log_rollups import get_log_series
+from app.services.log_search import search_logs
+from app.services.counters import increment_counter, reset_counter
+from app.models.logs_model import LogSearchParams
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
@@ -21,26 +27,56 @@ async def get_logs(
     start_date: Optional[str] = Query(None, description="Filtrar logs a partir desta data (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Filtrar logs até esta data (YYYY-MM-DD)"),
     limit: Optional[int] = Query(50, description="Número máximo de logs a serem retornados"),
+    cursor: Optional[str] = Query(None, description="Token de continuação retornado pela página anterior"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Retorna os logs do sistema, com possibilidade de filtragem por tipo e período.
     """
-    query = {}
+    try:
+        query = build_log_query(log_type, start_date, end_date)
+        page = await paginate(db["logs"], query, limit=limit, cursor=cursor)
+        return {"logs": page["items"], "next_cursor": page["next_cursor"]}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao buscar logs: {str(e)}")
 
+@router.get("/search")
+async def search_logs_endpoint(params: LogSearchParams = Depends(), db: AsyncIOMotorDatabase = Depends(get_database)):
+    """
+    Busca logs por texto livre em `event`/`mensagem`, com filtros por nível, origem, usuário e período.
+    Com texto, os resultados vêm ordenados por relevância.
+    """
     try:
-        if log_type:
-            query["log_type"] = log_type
-        if start_date:
-            query["timestamp"] = {"$gte": datetime.strptime(start_date, "%Y-%m-%d")}
-        if end_date:
-            query.setdefault("timestamp", {})["$lte"] = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        logs = await db["logs"].find(query).sort("timestamp", -1).limit(limit).to_list(length=limit)
-        return {"logs": logs}
+        return await search_logs(db, params)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao buscar logs: {str(e)}")
 
+@router.get("/rollups")
+async def get_log_rollups(
+    granularity: str = Query("hour", description="Tamanho do bucket (minute, hour)"),
+    start_date: Optional[str] = Query(None, description="Início do período (YYYY-MM-DD ou ISO 8601)"),
+    end_date: Optional[str] = Query(None, description="Fim do período (YYYY-MM-DD ou ISO 8601)"),
+    level: Optional[str] = Query(None, description="Filtrar por nível (INFO, WARNING, ERROR)"),
+    origem: Optional[str] = Query(None, description="Filtrar por origem"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Série temporal de contagens de logs por minuto ou hora, lida dos buckets pré-agregados em `log_rollups`.
+    """
+    try:
+        start = parse_date(start_date) if start_date else None
+        end = parse_date(end_date) if end_date else None
+        series = await get_log_series(db, granularity, start, end, level, origem)
+        return {"granularity": granularity, "series": series}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao buscar contagens de logs: {str(e)}")
+
 @router.get("/{log_id}")
 async def get_log_details(log_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
@@ -65,6 +101,7 @@ async def clear_all_logs(db: AsyncIOMotorDatabase = Depends(get_database)):
     """
     try:
         result = await db["logs"].delete_many({})
+        await reset_counter("logs")
         return {"message": f"{result.deleted_count} logs removidos com sucesso!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao limpar logs: {str(e)}")
@@ -79,6 +116,7 @@ async def delete_specific_log(log_id: str, db: AsyncIOMotorDatabase = Depends(ge
 
     try:
         result = await db["logs"].delete_one({"_id": ObjectId(log_id)})
+        await increment_counter("logs", -result.deleted_count)
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail=f"Log '{log_id}' não encontrado.")
 
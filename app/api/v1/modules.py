@@ -3,25 +3,28 @@ from app.services.module_manager import (
     create_module, update_module, delete_module, optimize_module, get_module_dependencies
 )
 from app.core.database import get_database
+from app.core.pagination import paginate
+from app.services.module_repository import get_module_by_name
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
+from typing import Optional
 
 router = APIRouter()
 
 @router.get("/")
-async def list_modules(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def list_modules(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Lista todos os módulos disponíveis no sistema.
+    Lista os módulos disponíveis no sistema, paginados do mais recente ao mais antigo.
     """
-    modules = await db["modules"].find().sort("created_at", -1).to_list(length=50)
-    return {"modules": modules}
+    page = await paginate(db["modules"], sort_field="created_at", limit=limit, cursor=cursor)
+    return {"modules": page["items"], "next_cursor": page["next_cursor"]}
 
 @router.get("/{module_name}")
 async def get_module_details(module_name: str, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
     Retorna detalhes sobre um módulo específico.
     """
-    module = await db["modules"].find_one({"name": module_name})
+    module = await get_module_by_name(module_name)
     if not module:
         raise HTTPException(status_code=404, detail=f"Módulo '{module_name}' não encontrado.")
     return {"module": module}
@@ -36,7 +39,7 @@ async def create_new_module(request: dict, db: AsyncIOMotorDatabase = Depends(ge
         raise HTTPException(status_code=400, detail="O nome do módulo não pode estar vazio.")
 
     # Verificar se já existe um módulo com esse nome
-    existing_module = await db["modules"].find_one({"name": module_name})
+    existing_module = await get_module_by_name(module_name)
     if existing_module:
         raise HTTPException(status_code=400, detail="Já existe um módulo com esse nome.")
 
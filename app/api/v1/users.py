@@ -3,10 +3,12 @@ from app.services.user_manager import (
     create_user, update_user, delete_user, set_user_permission, authenticate_user, request_password_reset
 )
 from app.core.database import get_database
+from app.core.pagination import paginate
 from app.core.security import generate_jwt_token, hash_password, verify_password
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from bson import ObjectId
+from typing import Optional
 
 router = APIRouter()
 
@@ -14,12 +16,12 @@ router = APIRouter()
 failed_login_attempts = {}
 
 @router.get("/")
-async def list_users(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def list_users(limit: int = 50, cursor: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
-    Lista todos os usuários cadastrados no sistema.
+    Lista os usuários cadastrados no sistema, paginados do mais recente ao mais antigo.
     """
-    users = await db["users"].find().sort("created_at", -1).to_list(length=50)
-    return {"users": users}
+    page = await paginate(db["users"], projection={"hashed_password": 0}, sort_field="created_at", limit=limit, cursor=cursor)
+    return {"users": page["items"], "next_cursor": page["next_cursor"]}
 
 @router.get("/{user_id}")
 async def get_user_details(user_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -48,7 +50,7 @@ async def create_new_user(request: dict, db: AsyncIOMotorDatabase = Depends(get_
     if not username or not email or not password:
         raise HTTPException(status_code=400, detail="Nome, e-mail e senha são obrigatórios.")
 
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password(password)
 
     result = await create_user(db, username, email, hashed_password, role)
     return {"message": f"Usuário '{username}' criado com sucesso!", "details": result}
@@ -0,0 +1,222 @@
+# app/core/batch_writer.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from pymongo.errors import BulkWriteError
+from app.core.database import get_database
+
+# Configuração de logs
+logger = logging.getLogger("batch_writer")
+logger.setLevel(logging.INFO)
+
+_STOP = object()
+
+# Recebe os documentos gravados com sucesso em um lote
+FlushListener = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+def _release(batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]):
+    """
+    Resolve como não gravados os documentos aguardados de um lote que não será mais enviado.
+    """
+    for _, written in batch:
+        if written is not None and not written.done():
+            written.set_result(False)
+
+
+class BatchWriter:
+    """
+    Grava documentos em lote (write-behind) em uma coleção do MongoDB.
+    Os documentos ficam em um buffer limitado e são enviados com `insert_many(ordered=False)`
+    quando o lote enche ou quando `flush_interval` segundos se passam.
+
+    Com o buffer cheio, `submit` espera até `block_timeout` segundos (None = espera sem limite,
+    0 = descarta imediatamente) e, se não houver espaço, descarta o documento e incrementa `dropped`.
+
+    Com `flush_interval=0` o lote é gravado assim que a fila esvazia (group commit): os documentos
+    que chegam durante uma gravação seguem juntos na próxima.
+
+    Funções registradas com `add_flush_listener` recebem, após cada lote, os documentos gravados
+    com sucesso (já com `_id`), permitindo manter índices e agregados derivados de forma incremental.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        block_timeout: Optional[float] = 0,
+    ):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.block_timeout = block_timeout
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_listeners: List[FlushListener] = []
+
+    def add_flush_listener(self, listener: FlushListener):
+        """
+        Registra uma função assíncrona chamada com os documentos de cada lote gravado.
+        """
+        self._flush_listeners.append(listener)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """
+        Inicia a tarefa de gravação em segundo plano no loop atual.
+        """
+        if self.running:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+        self._task = asyncio.create_task(self._run(), name=f"batch-writer:{self.collection}")
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Grava tudo o que estiver no buffer e encerra a tarefa em segundo plano.
+        """
+        if not self.running:
+            return
+
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Tempo esgotado ao descarregar o buffer de '{self.collection}'.")
+            # O cancelamento libera os documentos do lote em andamento; os da fila são liberados aqui
+            self._task.cancel()
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _STOP:
+                    _release([item])
+        finally:
+            self._task = None
+
+    async def submit(self, document: Dict[str, Any], wait: bool = False) -> bool:
+        """
+        Enfileira um documento para gravação. Retorna False se ele foi descartado.
+        Com `wait=True`, só retorna depois que o lote do documento for gravado,
+        indicando se a gravação teve sucesso.
+        """
+        if not self.running:
+            await self.start()
+
+        written = asyncio.get_running_loop().create_future() if wait else None
+        item = (document, written)
+        try:
+            if self.block_timeout is None:
+                await self._queue.put(item)
+            elif self.block_timeout > 0:
+                await asyncio.wait_for(self._queue.put(item), self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"⚠️ Buffer de '{self.collection}' cheio: {self.dropped} documentos descartados.")
+            return False
+
+        if written is None:
+            return True
+        # O lote é gravado mesmo que quem aguarda seja cancelado
+        return await asyncio.shield(written)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do buffer para monitoramento.
+        """
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            try:
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                _release(batch)
+                raise
+
+        # Encerramento: grava o que ainda restar no buffer
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                remaining.append(item)
+        try:
+            for start in range(0, len(remaining), self.batch_size):
+                await self._flush(remaining[start:start + self.batch_size])
+        except asyncio.CancelledError:
+            _release(remaining)
+            raise
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]):
+        documents = [document for document, _ in batch]
+        failed_indexes: Set[int] = set()
+        try:
+            db = await get_database()
+            await db[self.collection].insert_many(documents, ordered=False)
+            self.written += len(documents)
+        except BulkWriteError as e:
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+            inserted = e.details.get("nInserted", 0)
+            self.written += inserted
+            self.failed += len(documents) - inserted
+            logger.error(f"❌ Falha parcial ao gravar lote em '{self.collection}': {len(documents) - inserted} documentos.")
+        except Exception as e:
+            failed_indexes = set(range(len(documents)))
+            self.failed += len(documents)
+            logger.error(f"❌ Erro ao gravar lote em '{self.collection}': {str(e)}")
+
+        for index, (_, written) in enumerate(batch):
+            if written is not None and not written.done():
+                written.set_result(index not in failed_indexes)
+
+        if self._flush_listeners:
+            stored = [document for index, document in enumerate(documents) if index not in failed_indexes]
+            for listener in self._flush_listeners:
+                try:
+                    await listener(stored)
+                except Exception as e:
+                    logger.error(f"❌ Erro no processamento pós-gravação de '{self.collection}': {str(e)}")
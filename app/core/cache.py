@@ -1,48 +1,412 @@
 # app/core/cache.py
 
-import redis.asyncio as redis
+import asyncio
+import hashlib
+import logging
 import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+import bson
+from bson import json_util
 from dotenv import load_dotenv
+from redis.client import NEVER_DECODE
+from redis.exceptions import NoScriptError, RedisError
+from app.core.redis_pool import get_redis_client
+from app.core.metrics import CACHE_REQUESTS
+from app.core.singleflight import SingleFlight
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
-# Configuração do Redis
-REDIS_URI = os.getenv("REDIS_URI", "redis://maglev.proxy.rlwy.net:17929")
+# Configuração de logs
+logger = logging.getLogger("cache")
+logger.setLevel(logging.INFO)
+
+# Configuração do cache em processo (L1) na frente do Redis; 0 desativa
+CACHE_L1_MAX_ITEMS = int(os.getenv("CACHE_L1_MAX_ITEMS", 1024))
+CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", 1.0))  # Segundos; limita o atraso entre workers após uma escrita
+
+# Configuração do `get_or_compute`
+CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", 10))  # Segundos até o lock de cálculo expirar
+CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", 5))  # Segundos aguardando outro worker antes de calcular
+
+# Versões das tags de invalidação (ver `invalidate_tags`)
+TAG_VERSION_PREFIX = "tagver:"
+
+# Tags compartilhadas pelos serviços que cacheiam agregados
+CACHE_TAG_MODULES = "modules"
+CACHE_TAG_SYSTEM_CONFIG = "system_config"
+
+_MISSING = object()
+
+# Libera o lock só se ele ainda pertencer a quem o adquiriu
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Prefixo das entradas gravadas por `set`/`set_many`; valores sem ele (ex.: `set_cache`) são lidos como estão
+ENTRY_MARKER = b"\x00rc1"
+
+# Lê várias entradas e descarta as que registram uma versão de tag diferente da atual.
+# Cada entrada é ENTRY_MARKER + "tag\tversão\t...\n" seguido do valor serializado (cabeçalho vazio sem tags).
+_GET_VALID = """
+local marker = ARGV[2]
+local result = {}
+for i, key in ipairs(KEYS) do
+    local data = redis.call('GET', key)
+    local value = false
+    if data then
+        if string.sub(data, 1, #marker) ~= marker then
+            value = data
+        else
+            local newline = string.find(data, '\\n', #marker + 1, true)
+            if newline then
+                value = string.sub(data, newline + 1)
+                for tag, version in string.gmatch(string.sub(data, #marker + 1, newline - 1), '([^\\t]+)\\t([^\\t]+)') do
+                    if (redis.call('GET', ARGV[1] .. tag) or '0') ~= version then
+                        value = false
+                        break
+                    end
+                end
+            end
+        end
+    end
+    result[i] = value
+end
+return result
+"""
+_GET_VALID_SHA = hashlib.sha1(_GET_VALID.encode("utf-8")).hexdigest()
+
+
+class JSONSerializer:
+    """
+    JSON estendido do MongoDB (`bson.json_util`): preserva ObjectId, datetime e afins.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        return json_util.dumps(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json_util.loads(data)
+
+
+class BSONSerializer:
+    """
+    BSON binário: mais compacto e rápido para documentos do MongoDB.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        return bson.encode({"v": value})
+
+    def loads(self, data: bytes) -> Any:
+        return bson.decode(data)["v"]
+
+
+class StringSerializer:
+    """
+    Texto puro, compatível com os valores gravados por `set_cache`.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        return str(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return data.decode("utf-8")
+
+
+DEFAULT_SERIALIZER = JSONSerializer()
+
+
+class LocalLRU:
+    """
+    LRU em processo com expiração por entrada. Guarda os bytes serializados, para que
+    quem lê nunca altere o valor compartilhado.
+    """
+
+    def __init__(self, max_items: int = CACHE_L1_MAX_ITEMS, ttl: float = CACHE_L1_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: Optional[float] = None):
+        if self.max_items <= 0:
+            return
+        local_ttl = self.ttl if ttl is None else min(self.ttl, ttl)
+        self._entries[key] = (time.monotonic() + local_ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
 
 # Inicializa a conexão com o Redis
 class RedisCache:
-    def __init__(self):
+    def __init__(self, serializer=DEFAULT_SERIALIZER, local: Optional[LocalLRU] = None):
         self.redis = None
+        self.serializer = serializer
+        self.local = local if local is not None else LocalLRU()
+        self._computations = SingleFlight()
+        self._release_lock = None
 
     async def connect(self):
         """
-        Conecta ao Redis.
+        Usa o cliente do pool Redis compartilhado do processo.
         """
         if not self.redis:
-            self.redis = redis.Redis.from_url(REDIS_URI, decode_responses=True)
+            self.redis = get_redis_client()
 
     async def set_cache(self, key: str, value: str, ttl: int = 300):
         """
         Define um valor no cache com tempo de expiração.
         """
+        self.local.delete(key)
         await self.redis.setex(key, ttl, value)
 
     async def get_cache(self, key: str):
         """
         Obtém um valor do cache.
         """
-        return await self.redis.get(key)
+        value = await self.redis.get(key)
+        CACHE_REQUESTS.labels("hit" if value is not None else "miss").inc()
+        return value
 
     async def clear_cache(self, key: str):
         """
         Remove um valor do cache.
         """
+        self.local.delete(key)
         await self.redis.delete(key)
 
+    async def get(self, key: str, default: Any = None, serializer=None) -> Any:
+        """
+        Obtém um valor serializado, consultando o L1 antes do Redis.
+        """
+        return (await self.get_many([key], serializer)).get(key, default)
+
+    async def set(self, key: str, value: Any, ttl: int = 300, serializer=None, tags: Iterable[str] = (), versions: Optional[Dict[str, str]] = None):
+        """
+        Serializa e grava um valor com tempo de expiração (também no L1 deste processo).
+        """
+        await self.set_many({key: value}, ttl, serializer, tags, versions)
+
+    async def get_many(self, keys: Iterable[str], serializer=None) -> Dict[str, Any]:
+        """
+        Obtém vários valores em uma única ida ao Redis para o que não estiver no L1.
+        Chaves ausentes ou invalidadas por tag não aparecem no resultado.
+        """
+        serializer = serializer or self.serializer
+        found: Dict[str, bytes] = {}
+        missing: List[str] = []
+        keys = list(dict.fromkeys(keys))
+        requested = len(keys)
+        for key in keys:
+            data = self.local.get(key)
+            if data is None:
+                missing.append(key)
+            else:
+                found[key] = data
+
+        if missing:
+            values = await self._get_valid(missing)
+            for key, data in zip(missing, values):
+                if data is not None:
+                    found[key] = data
+                    self.local.set(key, data)
+
+        result = {}
+        for key, data in found.items():
+            try:
+                result[key] = serializer.loads(data)
+            except Exception as e:
+                # Ex.: valor gravado com outro serializador; tratado como ausente
+                logger.warning(f"⚠️ Valor em cache ilegível em '{key}': {str(e)}")
+                self.local.delete(key)
+        CACHE_REQUESTS.labels("hit").inc(len(result))
+        CACHE_REQUESTS.labels("miss").inc(requested - len(result))
+        return result
+
+    async def _get_valid(self, keys: List[str]) -> List[Optional[bytes]]:
+        # NEVER_DECODE devolve bytes mesmo com o cliente configurado para decodificar texto
+        args = ["EVALSHA", _GET_VALID_SHA, len(keys), *keys, TAG_VERSION_PREFIX, ENTRY_MARKER]
+        try:
+            values = await self.redis.execute_command(*args, **{NEVER_DECODE: True})
+        except NoScriptError:
+            await self.redis.script_load(_GET_VALID)
+            values = await self.redis.execute_command(*args, **{NEVER_DECODE: True})
+        return list(values)
+
+    async def set_many(self, values: Dict[str, Any], ttl: int = 300, serializer=None, tags: Iterable[str] = (), versions: Optional[Dict[str, str]] = None):
+        """
+        Grava vários valores em um único pipeline. Com `tags`, as entradas registram a versão atual
+        de cada tag e deixam de ser lidas após `invalidate_tags`. Quem calcula o valor a partir do banco
+        deve passar as `versions` lidas antes da consulta (como faz `get_or_compute`), para que uma
+        invalidação concorrente não seja mascarada.
+        """
+        if not values:
+            return
+        serializer = serializer or self.serializer
+        tags = list(tags)
+        if tags and versions is None:
+            versions = await self.tag_versions(tags)
+        header = ENTRY_MARKER + "\t".join(f"{tag}\t{versions[tag]}" for tag in tags).encode("utf-8") + b"\n"
+
+        encoded = {key: serializer.dumps(value) for key, value in values.items()}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, data in encoded.items():
+                pipe.set(key, header + data, px=int(ttl * 1000))
+            await pipe.execute()
+        for key, data in encoded.items():
+            self.local.set(key, data, ttl)
+
+    async def tag_versions(self, tags: Iterable[str]) -> Dict[str, str]:
+        """
+        Versões atuais das tags ("0" para tags nunca invalidadas).
+        """
+        tags = list(tags)
+        for tag in tags:
+            if not tag or "\t" in tag or "\n" in tag:
+                raise ValueError(f"Tag de cache inválida: {tag!r}")
+        if not tags:
+            return {}
+        current = await self.redis.mget([f"{TAG_VERSION_PREFIX}{tag}" for tag in tags])
+        return {tag: version or "0" for tag, version in zip(tags, current)}
+
+    async def invalidate_tags(self, *tags: str):
+        """
+        Invalida todas as entradas com alguma das tags trocando a versão da tag: O(1) por tag,
+        sem procurar as chaves. As entradas antigas deixam de ser lidas e expiram pelo TTL.
+        O L1 deste processo é descartado; o dos demais workers expira em `CACHE_L1_TTL`.
+        """
+        if not tags:
+            return
+        # Versões únicas (e não um contador) evitam que uma versão antiga volte a valer
+        version = f"{time.time_ns():x}{secrets.token_hex(4)}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.set(f"{TAG_VERSION_PREFIX}{tag}", version)
+            await pipe.execute()
+        self.local.clear()
+
+    async def delete(self, *keys: str):
+        """
+        Remove valores do Redis e do L1 deste processo.
+        """
+        if not keys:
+            return
+        self.local.delete(*keys)
+        await self.redis.delete(*keys)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = 300,
+        serializer=None,
+        tags: Iterable[str] = (),
+        lock_timeout: float = CACHE_LOCK_TIMEOUT,
+        wait_timeout: float = CACHE_LOCK_WAIT,
+    ) -> Any:
+        """
+        Retorna o valor em cache ou o calcula uma única vez: chamadas simultâneas no processo
+        são coalescidas e, entre workers, um lock no Redis (`lock:{key}`) deixa só um calcular
+        enquanto os demais aguardam o valor. Se o lock não liberar em `wait_timeout`, calcula sem ele.
+        Com `tags`, o valor é descartado por `invalidate_tags` de qualquer uma delas.
+        """
+        serializer = serializer or self.serializer
+        tags = list(tags)
+        value = await self.get(key, _MISSING, serializer)
+        if value is not _MISSING:
+            return value
+        return await self._computations.do(key, lambda: self._compute_locked(key, compute, ttl, serializer, tags, lock_timeout, wait_timeout))
+
+    async def _compute_and_store(self, key, compute, ttl, serializer, tags) -> Any:
+        versions = await self.tag_versions(tags)  # Antes de calcular: invalidações durante o cálculo vencem
+        value = await compute()
+        await self.set(key, value, ttl, serializer, tags, versions)
+        return value
+
+    async def _compute_locked(self, key, compute, ttl, serializer, tags, lock_timeout, wait_timeout) -> Any:
+        lock_key = f"lock:{key}"
+        token = secrets.token_hex(8)
+        deadline = time.monotonic() + wait_timeout
+        delay = 0.01
+
+        while True:
+            if await self.redis.set(lock_key, token, nx=True, px=int(lock_timeout * 1000)):
+                try:
+                    # Outro worker pode ter gravado o valor entre a leitura e o lock
+                    value = await self.get(key, _MISSING, serializer)
+                    if value is _MISSING:
+                        value = await self._compute_and_store(key, compute, ttl, serializer, tags)
+                    return value
+                finally:
+                    await self._unlock(lock_key, token)
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            value = await self.get(key, _MISSING, serializer)
+            if value is not _MISSING:
+                return value
+            if time.monotonic() >= deadline:
+                logger.warning(f"⚠️ Lock de '{key}' não liberado em {wait_timeout}s; calculando sem ele.")
+                return await self._compute_and_store(key, compute, ttl, serializer, tags)
+
+    async def _unlock(self, lock_key: str, token: str):
+        try:
+            if self._release_lock is None:
+                self._release_lock = self.redis.register_script(_RELEASE_LOCK)
+            await self._release_lock(keys=[lock_key], args=[token])
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao liberar lock '{lock_key}': {str(e)}")
+
+
 # Instância global do cache
 cache = RedisCache()
 
 async def get_redis_cache():
     await cache.connect()
     return cache
+
+async def invalidate_cache_tags(*tags: str):
+    """
+    Função global para invalidar entradas por tag. Falhas são apenas registradas:
+    as entradas afetadas ainda expiram pelo TTL.
+    """
+    try:
+        redis_cache = await get_redis_cache()
+        await redis_cache.invalidate_tags(*tags)
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao invalidar tags de cache {tags}: {str(e)}")
+
+async def cached(key: str, compute: Callable[[], Awaitable[Any]], ttl: int = 300, tags: Iterable[str] = ()) -> Any:
+    """
+    Função global para `get_or_compute`; com o Redis indisponível, calcula o valor diretamente.
+    """
+    try:
+        redis_cache = await get_redis_cache()
+        return await redis_cache.get_or_compute(key, compute, ttl, tags=tags)
+    except (RedisError, OSError) as e:
+        logger.warning(f"⚠️ Cache indisponível para '{key}': {str(e)}")
+        return await compute()
@@ -1,8 +1,9 @@
 import logging
 import motor.motor_asyncio
-import redis.asyncio as redis
 import os
 from dotenv import load_dotenv
+from app.core.instrumentation import mongo_command_metrics
+from app.core.redis_pool import get_redis_client
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -16,16 +17,10 @@ MONGO_URI = os.getenv("MONGO_URI")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "ia-dev")
 MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", 5000))  # Timeout de 5 segundos
 
-# Configuração do Redis
-REDIS_URI = os.getenv("REDIS_URI")
-
 # Verificação das variáveis de ambiente
 if not MONGO_URI:
     raise ValueError("❌ ERRO: A variável 'MONGO_URI' não está configurada. Configure no Railway.")
 
-if not REDIS_URI:
-    raise ValueError("❌ ERRO: A variável 'REDIS_URI' não está configurada. Configure no Railway.")
-
 class Database:
     def __init__(self):
         self.client = None
@@ -40,7 +35,8 @@ class Database:
             if self.client is None:
                 logger.info("🔹 Conectando ao MongoDB...")
                 self.client = motor.motor_asyncio.AsyncIOMotorClient(
-                    MONGO_URI, serverSelectionTimeoutMS=MONGO_TIMEOUT_MS
+                    MONGO_URI, serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                    event_listeners=[mongo_command_metrics]  # Latência por coleção em /metrics
                 )
                 self.db = self.client[DATABASE_NAME]
                 await self.db.command("ping")  # Testa conexão
@@ -48,7 +44,7 @@ class Database:
 
             if self.redis is None:
                 logger.info("🔹 Conectando ao Redis...")
-                self.redis = redis.Redis.from_url(REDIS_URI, decode_responses=True)
+                self.redis = get_redis_client()  # Pool compartilhado com o cache (app/core/redis_pool.py)
                 if await self.redis.ping():
                     logger.info("✅ Conectado ao Redis com sucesso.")
                 else:
@@ -0,0 +1,124 @@
+# app/core/hashing.py
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import bcrypt
+from app.core.metrics import BCRYPT_DURATION, BCRYPT_PENDING, BCRYPT_QUEUE_WAIT, BCRYPT_REJECTED
+
+# Configuração do pool de hashing (o bcrypt libera o GIL, então threads escalam entre núcleos)
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", os.cpu_count() or 1))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 64))  # Operações em execução + na fila
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+
+class HashingPoolBusy(Exception):
+    """
+    Levantada quando a fila do pool de hashing atinge o limite configurado.
+    """
+
+
+class PasswordHasher:
+    """
+    Executa hash e verificação bcrypt em um pool dedicado de threads, fora do event loop.
+    A profundidade da fila é limitada por `max_pending`; acima disso as chamadas são rejeitadas.
+    """
+
+    def __init__(self, workers: int = BCRYPT_WORKERS, max_pending: int = BCRYPT_MAX_PENDING, rounds: int = BCRYPT_ROUNDS):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.rounds = rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._metrics = {
+            "calls": 0,
+            "rejected": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "hash_ms_total": 0.0,
+            "hash_ms_max": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, operation: str, function: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._metrics["rejected"] += 1
+            BCRYPT_REJECTED.inc()
+            raise HashingPoolBusy(f"Fila de hashing cheia ({self.max_pending} operações pendentes).")
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            result = function(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, queue_wait, hash_time = await loop.run_in_executor(self._get_executor(), task)
+        finally:
+            self._pending -= 1
+
+        self._record(queue_wait * 1000, hash_time * 1000)
+        BCRYPT_QUEUE_WAIT.observe(queue_wait)
+        BCRYPT_DURATION.labels(operation).observe(hash_time)
+        return result
+
+    def _record(self, queue_wait_ms: float, hash_ms: float):
+        metrics = self._metrics
+        metrics["calls"] += 1
+        metrics["queue_wait_ms_total"] += queue_wait_ms
+        metrics["queue_wait_ms_max"] = max(metrics["queue_wait_ms_max"], queue_wait_ms)
+        metrics["hash_ms_total"] += hash_ms
+        metrics["hash_ms_max"] = max(metrics["hash_ms_max"], hash_ms)
+
+    async def hash(self, password: str) -> str:
+        """
+        Gera o hash bcrypt de uma senha.
+        """
+        hashed = await self._run("hash", bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+        return hashed.decode("utf-8")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifica uma senha contra o hash armazenado.
+        """
+        return await self._run("verify", bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas do pool: chamadas, rejeições, espera na fila e tempo de hash.
+        """
+        metrics = self._metrics
+        calls = metrics["calls"] or 1
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "calls": metrics["calls"],
+            "rejected": metrics["rejected"],
+            "queue_wait_ms_avg": round(metrics["queue_wait_ms_total"] / calls, 3),
+            "queue_wait_ms_max": round(metrics["queue_wait_ms_max"], 3),
+            "hash_ms_avg": round(metrics["hash_ms_total"] / calls, 3),
+            "hash_ms_max": round(metrics["hash_ms_max"], 3),
+        }
+
+    def shutdown(self):
+        """
+        Encerra as threads do pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Instância global do pool de hashing
+password_hasher = PasswordHasher()
+BCRYPT_PENDING.set_function(lambda: password_hasher._pending)
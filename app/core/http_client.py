@@ -0,0 +1,188 @@
+# app/core/http_client.py
+
+import asyncio
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+# Configuração de logs
+logger = logging.getLogger("http_client")
+logger.setLevel(logging.INFO)
+
+# Configuração do pool de conexões HTTP
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 20))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", 20))  # Requisições simultâneas por host
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))  # Segundos
+
+# Timeouts e novas tentativas
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 60))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.25))  # Segundos
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 4))  # Segundos
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class HTTPClient:
+    """
+    Cliente HTTP assíncrono compartilhado pelas integrações externas.
+    Mantém conexões keep-alive em pool, limita requisições simultâneas por host e
+    repete falhas transitórias com backoff exponencial e jitter.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        max_per_host: int = HTTP_MAX_PER_HOST,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=read_timeout, pool=connect_timeout)
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self):
+        """
+        Abre o pool de conexões (chamado no startup da aplicação).
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+
+    async def close(self):
+        """
+        Fecha o pool de conexões (chamado no shutdown da aplicação).
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._host_limits.clear()
+
+    async def get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Espera antes da próxima tentativa: respeita `Retry-After` ou usa backoff exponencial com jitter.
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), HTTP_BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retries: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Executa uma requisição HTTP com novas tentativas em falhas transitórias.
+        Timeouts de leitura só são repetidos em métodos idempotentes (ou com `idempotent=True`).
+        """
+        client = await self.get_client()
+        retries = self.retries if retries is None else retries
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(retries + 1):
+            retry_after = None
+            async with self._host_limit(url):
+                try:
+                    response = await client.request(method, url, **kwargs)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                    if attempt == retries:
+                        raise
+                    logger.warning(f"⚠️ Falha de conexão com {url} ({type(e).__name__}), tentativa {attempt + 1}.")
+                except (httpx.ReadTimeout, httpx.RemoteProtocolError) as e:
+                    if not idempotent or attempt == retries:
+                        raise
+                    logger.warning(f"⚠️ Falha de leitura em {url} ({type(e).__name__}), tentativa {attempt + 1}.")
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                        return response
+                    retry_after = response.headers.get("Retry-After")
+                    await response.aclose()
+                    logger.warning(f"⚠️ {url} respondeu {response.status_code}, tentativa {attempt + 1}.")
+
+            await asyncio.sleep(self.backoff(attempt, retry_after))
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Abre uma resposta em streaming. Novas tentativas só acontecem antes do primeiro byte
+        (falhas de conexão e status transitórios); a vaga do host fica ocupada até o fim do stream.
+        """
+        client = await self.get_client()
+        retries = self.retries if retries is None else retries
+
+        async with self._host_limit(url):
+            for attempt in range(retries + 1):
+                request = client.build_request(method, url, **kwargs)
+                try:
+                    response = await client.send(request, stream=True)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                    if attempt == retries:
+                        raise
+                    logger.warning(f"⚠️ Falha de conexão com {url} ({type(e).__name__}), tentativa {attempt + 1}.")
+                    await asyncio.sleep(self.backoff(attempt))
+                    continue
+
+                if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                    retry_after = response.headers.get("Retry-After")
+                    await response.aclose()
+                    logger.warning(f"⚠️ {url} respondeu {response.status_code}, tentativa {attempt + 1}.")
+                    await asyncio.sleep(self.backoff(attempt, retry_after))
+                    continue
+                break
+
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+
+# Instância global do cliente HTTP
+http_client = HTTPClient()
+
+async def get_http_client() -> HTTPClient:
+    """
+    Função global para obter o cliente HTTP compartilhado.
+    """
+    await http_client.start()
+    return http_client
@@ -0,0 +1,89 @@
+# app/core/instrumentation.py
+
+import threading
+import time
+from typing import Dict, Tuple
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from pymongo import monitoring
+from app.core.metrics import MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES, REDIS_COMMAND_DURATION, REDIS_COMMAND_FAILURES
+
+# Comandos cujo primeiro campo não é o nome da coleção
+_NO_COLLECTION = "-"
+_PIPELINE = "PIPELINE"
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Listener de comandos do driver do MongoDB que mede a latência por coleção e comando.
+    Os eventos chegam nas threads do driver; o nome da coleção só existe no evento de início,
+    então é guardado até o evento de término correspondente.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = _NO_COLLECTION
+        with self._lock:
+            self._pending[self._key(event)] = collection
+
+    def _finish(self, event) -> str:
+        with self._lock:
+            return self._pending.pop(self._key(event), _NO_COLLECTION)
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+class InstrumentedPipeline(Pipeline):
+    """
+    Pipeline do Redis que mede cada `execute` como um único comando `PIPELINE`.
+    """
+
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            REDIS_COMMAND_FAILURES.labels(_PIPELINE).inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels(_PIPELINE).observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Cliente Redis que mede a latência de cada comando (scripts Lua aparecem como EVALSHA).
+    """
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            REDIS_COMMAND_FAILURES.labels(command).inc()
+            raise
+        finally:
+            REDIS_COMMAND_DURATION.labels(command).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+# Listener global, registrado no cliente do MongoDB
+mongo_command_metrics = MongoCommandMetrics()
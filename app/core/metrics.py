@@ -0,0 +1,295 @@
+# app/core/metrics.py
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Formato de exposição texto do Prometheus
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets padrão (segundos) para latência de requisições HTTP
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Buckets mais finos para operações de banco e cache, que costumam ficar abaixo de 1 ms
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Timer:
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._started)
+
+
+class _Metric:
+    """
+    Base das métricas: uma família com nome, descrição e rótulos, e um filho por combinação de valores.
+    As atualizações são protegidas por lock porque o listener do MongoDB roda nas threads do driver.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: str):
+        """
+        Retorna a série da combinação de rótulos, criando-a na primeira chamada.
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"Métrica '{self.name}' espera os rótulos {self.labelnames}.")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self, key: Tuple[str, ...], child) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            lines.extend(self._samples(key, child))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """
+    Valor que só cresce (requisições, acertos de cache, rejeições).
+    """
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def _samples(self, key, child):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """
+        Lê o valor de `function` a cada coleta, em vez de manter um valor próprio.
+        """
+        self.function = function
+
+    def get(self) -> float:
+        return float(self.function()) if self.function else self.value
+
+
+class Gauge(_Metric):
+    """
+    Valor que sobe e desce (requisições em andamento, tamanho de filas).
+    """
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.set_function(function)
+
+    def _samples(self, key, child):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...], lock: threading.Lock):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # O último bucket é +Inf
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        """
+        Context manager que observa a duração do bloco em segundos.
+        """
+        return _Timer(self)
+
+
+class Histogram(_Metric):
+    """
+    Distribuição em buckets fixos (limites superiores inclusivos), exposta de forma cumulativa.
+    Percentis são calculados no Prometheus com `histogram_quantile`.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(float(bound) for bound in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds, self._lock)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _samples(self, key, child):
+        with self._lock:
+            counts = list(child.counts)
+            total_sum = child.sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas do processo, exposto no formato texto do Prometheus.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica '{metric.name}' já registrada.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Gera o texto servido em `/metrics`.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registro global de métricas
+registry = MetricsRegistry()
+
+# Requisições HTTP (alimentadas pelo RequestTimingMiddleware)
+HTTP_REQUESTS = registry.counter("http_requests_total", "Requisições HTTP atendidas.", ("route", "method", "status"))
+HTTP_REQUEST_DURATION = registry.histogram("http_request_duration_seconds", "Latência das requisições HTTP por rota.", ("route", "method"))
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+
+# MongoDB e Redis
+MONGO_COMMAND_DURATION = registry.histogram("mongodb_command_duration_seconds", "Latência dos comandos do MongoDB por coleção.", ("collection", "command"), FAST_BUCKETS)
+MONGO_COMMAND_FAILURES = registry.counter("mongodb_command_failures_total", "Comandos do MongoDB com falha.", ("collection", "command"))
+REDIS_COMMAND_DURATION = registry.histogram("redis_command_duration_seconds", "Latência dos comandos do Redis.", ("command",), FAST_BUCKETS)
+REDIS_COMMAND_FAILURES = registry.counter("redis_command_failures_total", "Comandos do Redis com falha.", ("command",))
+REDIS_POOL_WAIT = registry.histogram("redis_pool_wait_seconds", "Tempo para obter uma conexão do pool do Redis (inclui conectar).", (), FAST_BUCKETS)
+REDIS_POOL_EXHAUSTED = registry.counter("redis_pool_exhausted_total", "Pedidos de conexão que esgotaram a espera com o pool cheio.")
+REDIS_POOL_CONNECTIONS = registry.gauge("redis_pool_connections", "Conexões do pool do Redis por estado.", ("state",))
+REDIS_UP = registry.gauge("redis_up", "1 se o último health check do Redis respondeu.")
+
+# Autenticação
+BCRYPT_DURATION = registry.histogram("bcrypt_duration_seconds", "Tempo de execução do bcrypt.", ("operation",))
+BCRYPT_QUEUE_WAIT = registry.histogram("bcrypt_queue_wait_seconds", "Espera na fila do pool de hashing.", (), FAST_BUCKETS)
+BCRYPT_PENDING = registry.gauge("bcrypt_pending", "Operações de hashing em execução ou na fila.")
+BCRYPT_REJECTED = registry.counter("bcrypt_rejected_total", "Operações de hashing rejeitadas com a fila cheia.")
+JWT_DURATION = registry.histogram("jwt_duration_seconds", "Tempo de emissão e validação de tokens JWT.", ("operation",), FAST_BUCKETS)
+
+# Cache
+CACHE_REQUESTS = registry.counter("cache_requests_total", "Leituras do RedisCache por resultado (hit/miss).", ("result",))
@@ -0,0 +1,110 @@
+# app/core/pagination.py
+
+import base64
+import os
+from typing import Any, Dict, Optional
+from bson import json_util
+from fastapi import HTTPException
+from pymongo import DESCENDING
+
+# Limites de paginação aplicados no servidor
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """
+    Restringe o tamanho de página solicitado ao intervalo permitido pelo servidor.
+    """
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_cursor(sort_field: str, value: Any, document_id: Any) -> str:
+    """
+    Gera um token opaco de continuação a partir da última posição `(valor, _id)` da página.
+    """
+    payload = json_util.dumps({"f": sort_field, "v": value, "id": document_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str) -> tuple:
+    """
+    Decodifica um token de continuação, validando o campo de ordenação.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if payload["f"] != sort_field:
+            raise ValueError("campo de ordenação diferente")
+        return payload["v"], payload["id"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+
+def _keyset_filter(sort_field: str, value: Any, document_id: Any) -> Dict[str, Any]:
+    """
+    Filtro que posiciona a consulta logo após `(valor, _id)` na ordem decrescente.
+    Documentos com o campo nulo ou ausente vêm por último nessa ordem, mas `$lt` não os alcança
+    (comparação por tipo do MongoDB), por isso entram em um ramo próprio.
+    """
+    if value is None:
+        return {sort_field: None, "_id": {"$lt": document_id}}
+    return {"$or": [
+        {sort_field: {"$lt": value}},
+        {sort_field: value, "_id": {"$lt": document_id}},
+        {sort_field: None},
+    ]}
+
+
+async def paginate(
+    collection,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    sort_field: str = "timestamp",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Pagina uma coleção por keyset em `(sort_field, _id)`, do mais recente ao mais antigo.
+    O custo de cada página é o mesmo, independentemente da profundidade.
+    """
+    page_size = clamp_page_size(limit)
+    query = dict(query or {})
+
+    if cursor:
+        value, document_id = decode_cursor(cursor, sort_field)
+        keyset = _keyset_filter(sort_field, value, document_id)
+        query = {"$and": [query, keyset]} if query else keyset
+
+    # O cursor depende de `_id` e do campo de ordenação, mesmo que a projeção os exclua
+    hidden_fields = []
+    if projection:
+        projection = dict(projection)
+        for field in ("_id", sort_field):
+            if field in projection and not projection[field]:
+                projection.pop(field)
+                hidden_fields.append(field)
+
+        inclusive = any(value for field, value in projection.items() if field != "_id")
+        if inclusive and sort_field not in projection:
+            projection[sort_field] = 1
+            hidden_fields.append(sort_field)
+
+    items = await collection.find(query, projection or None) \
+        .sort([(sort_field, DESCENDING), ("_id", DESCENDING)]) \
+        .limit(page_size + 1) \
+        .to_list(length=page_size + 1)
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(sort_field, last.get(sort_field), last["_id"])
+
+    for item in items:
+        for field in hidden_fields:
+            item.pop(field, None)
+
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,98 @@
+# app/core/quantiles.py
+
+import math
+from typing import Dict, Iterable, Optional
+
+# Erro relativo máximo dos percentis estimados (1% do valor real)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Valores abaixo disso (ex.: 0 ms) caem no bucket zero
+MIN_INDEXABLE_VALUE = 1e-6
+
+
+class DDSketch:
+    """
+    Sketch de quantis com erro relativo garantido (DDSketch): cada valor positivo vai para o bucket
+    `ceil(log_gamma(valor))`, com `gamma = (1 + α) / (1 - α)`. A memória depende só da faixa de valores
+    (~230 buckets por fator 10 com α = 1%), não do número de observações, e dois sketches com o mesmo
+    α se combinam somando os buckets — inclusive no MongoDB, com `$inc`.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "_log_gamma", "bins", "zero_count", "count", "sum")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def key(self, value: float) -> int:
+        """
+        Índice do bucket que contém o valor.
+        """
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, weight: int = 1):
+        """
+        Registra uma observação (valores negativos são tratados como zero).
+        """
+        if value > MIN_INDEXABLE_VALUE:
+            key = self.key(value)
+            self.bins[key] = self.bins.get(key, 0) + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+
+    def merge(self, other: "DDSketch"):
+        """
+        Soma outro sketch a este. Ambos precisam ter a mesma precisão relativa.
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches com precisões diferentes não podem ser combinados.")
+        self.merge_bins(other.bins, other.zero_count, other.count, other.sum)
+
+    def merge_bins(self, bins: Dict, zero_count: int = 0, count: Optional[int] = None, total: float = 0.0):
+        """
+        Soma buckets serializados (chaves podem ser strings, como no MongoDB).
+        """
+        added = zero_count
+        for key, weight in bins.items():
+            key = int(key)
+            self.bins[key] = self.bins.get(key, 0) + weight
+            added += weight
+        self.zero_count += zero_count
+        self.count += added if count is None else count
+        self.sum += total
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil `q` (0 a 1). Retorna None se o sketch estiver vazio.
+        """
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # Ponto do bucket (γ^(k-1), γ^k] com o menor erro relativo
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        """
+        Estima vários quantis de uma vez.
+        """
+        return {q: self.quantile(q) for q in qs}
+
+    def to_bins(self) -> Dict[str, int]:
+        """
+        Buckets com chaves em texto, prontos para gravar no MongoDB.
+        """
+        return {str(key): weight for key, weight in self.bins.items()}
@@ -0,0 +1,139 @@
+# app/core/redis_pool.py
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from redis.asyncio import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.core.instrumentation import InstrumentedRedis
+from app.core.metrics import REDIS_POOL_CONNECTIONS, REDIS_POOL_EXHAUSTED, REDIS_POOL_WAIT, REDIS_UP
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+# Configuração de logs
+logger = logging.getLogger("redis_pool")
+logger.setLevel(logging.INFO)
+
+# Configuração do pool de conexões Redis compartilhado por todo o processo
+REDIS_URI = os.getenv("REDIS_URI")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))  # Conexões por worker
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 2))  # Segundos esperando uma conexão livre
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))  # Segundos por comando
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))  # Segundos; PING em conexões ociosas e no monitor
+
+if not REDIS_URI:
+    raise ValueError("❌ ERRO: A variável 'REDIS_URI' não está configurada. Configure no Railway.")
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Pool com limite de conexões que bloqueia (até `timeout`) quando todas estão em uso,
+    medindo a espera por uma conexão e contando os esgotamentos.
+    """
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as e:
+            if str(e) == "No connection available.":  # Tempo esgotado esperando uma conexão livre
+                REDIS_POOL_EXHAUSTED.inc()
+            raise
+        finally:
+            REDIS_POOL_WAIT.observe(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, int]:
+        in_use = len(self._in_use_connections)
+        return {
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "idle": len(self._available_connections),
+            "created": in_use + len(self._available_connections),
+        }
+
+
+class RedisPool:
+    """
+    Cliente Redis único do processo (banco, cache, segurança, contadores e performance tuner),
+    sobre um pool limitado a `REDIS_MAX_CONNECTIONS`. Um monitor faz PING periódico e expõe
+    a disponibilidade em `redis_up`.
+    """
+
+    def __init__(self, uri: str = REDIS_URI, max_connections: int = REDIS_MAX_CONNECTIONS, health_check_interval: int = REDIS_HEALTH_CHECK_INTERVAL):
+        self.uri = uri
+        self.max_connections = max_connections
+        self.health_check_interval = health_check_interval
+        self.pool: Optional[InstrumentedConnectionPool] = None
+        self._client: Optional[InstrumentedRedis] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def client(self) -> InstrumentedRedis:
+        """
+        Retorna o cliente compartilhado, criando o pool na primeira chamada.
+        """
+        if self._client is None:
+            self.pool = InstrumentedConnectionPool.from_url(
+                self.uri,
+                max_connections=self.max_connections,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                health_check_interval=self.health_check_interval,
+                decode_responses=True,
+            )
+            self._client = InstrumentedRedis(connection_pool=self.pool)
+        return self._client
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna o uso atual do pool para monitoramento.
+        """
+        return self.pool.stats() if self.pool else {"max_connections": self.max_connections, "in_use": 0, "idle": 0, "created": 0}
+
+    async def _monitor(self):
+        while True:
+            try:
+                await self.client().ping()
+                REDIS_UP.set(1)
+            except Exception as e:
+                REDIS_UP.set(0)
+                logger.warning(f"⚠️ Redis não respondeu ao health check: {str(e)}")
+            await asyncio.sleep(self.health_check_interval)
+
+    async def start(self):
+        """
+        Inicia o health check periódico (chamado no startup da aplicação).
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._monitor(), name="redis-pool:health")
+
+    async def close(self):
+        """
+        Encerra o monitor e fecha as conexões do pool (chamado no shutdown da aplicação).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pool is not None:
+            await self.pool.disconnect()
+
+
+# Instância global do pool Redis
+redis_pool = RedisPool()
+REDIS_POOL_CONNECTIONS.labels("in_use").set_function(lambda: redis_pool.stats()["in_use"])
+REDIS_POOL_CONNECTIONS.labels("idle").set_function(lambda: redis_pool.stats()["idle"])
+
+def get_redis_client() -> InstrumentedRedis:
+    """
+    Função global para obter o cliente Redis compartilhado.
+    """
+    return redis_pool.client()
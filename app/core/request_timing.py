@@ -0,0 +1,133 @@
+# app/core/request_timing.py
+
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from app.core.batch_writer import BatchWriter
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT
+
+# Configuração de logs
+logger = logging.getLogger("request_timing")
+logger.setLevel(logging.INFO)
+
+# Configuração do registro de requisições em `api_logs`
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", 1.0))  # Fração das requisições gravadas
+REQUEST_LOG_ALWAYS_SLOW_MS = float(os.getenv("REQUEST_LOG_ALWAYS_SLOW_MS", 500))  # Lentas são sempre gravadas
+REQUEST_LOG_BATCH_SIZE = int(os.getenv("REQUEST_LOG_BATCH_SIZE", 500))
+REQUEST_LOG_FLUSH_INTERVAL = float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", 1.0))  # Segundos
+REQUEST_LOG_MAX_BUFFER = int(os.getenv("REQUEST_LOG_MAX_BUFFER", 20000))
+
+UNMATCHED_ROUTE = "unmatched"  # Caminhos sem rota (404) não viram uma série por URL
+
+# Recebe cada requisição medida (amostrada ou não)
+RequestObserver = Callable[[Dict[str, Any]], None]
+
+# Buffer de gravação em lote da coleção `api_logs`; descarta quando cheio para nunca segurar a resposta
+api_log_sink = BatchWriter(
+    "api_logs",
+    batch_size=REQUEST_LOG_BATCH_SIZE,
+    flush_interval=REQUEST_LOG_FLUSH_INTERVAL,
+    max_buffer=REQUEST_LOG_MAX_BUFFER,
+    block_timeout=0,
+)
+
+_observers: List[RequestObserver] = []
+
+
+def add_request_observer(observer: RequestObserver):
+    """
+    Registra uma função chamada com cada requisição medida: `route`, `method`,
+    `status_code`, `response_time` (ms) e `response_size` (bytes). Deve ser rápida e síncrona.
+    """
+    _observers.append(observer)
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """
+    Caminho declarado da rota (ex.: `/modules/{module_name}`), preenchido pelo roteador no scope.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if not path:
+        return UNMATCHED_ROUTE
+    return f"{scope.get('root_path', '')}{path}"
+
+
+class RequestTimingMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP e grava uma amostra em `api_logs`
+    pelo `api_log_sink`, sem esperar o MongoDB. Requisições mais lentas que
+    `REQUEST_LOG_ALWAYS_SLOW_MS` são sempre gravadas; as demais com probabilidade `sample_rate`,
+    e cada documento leva `weight = 1 / sample_rate` para que contagens possam ser reescaladas.
+    """
+
+    def __init__(self, app, sample_rate: float = REQUEST_LOG_SAMPLE_RATE, sink: Optional[BatchWriter] = None):
+        self.app = app
+        self.sample_rate = max(0.0, min(sample_rate, 1.0))
+        self.sink = sink or api_log_sink
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            await self._record(scope, status_code, response_size, (time.perf_counter() - started) * 1000)
+
+    async def _record(self, scope, status_code: int, response_size: int, response_time: float):
+        record = {
+            "route": route_template(scope),
+            "method": scope["method"],
+            "status_code": status_code,
+            "response_time": round(response_time, 3),
+            "response_size": response_size,
+        }
+        HTTP_REQUESTS.labels(record["route"], record["method"], status_code).inc()
+        HTTP_REQUEST_DURATION.labels(record["route"], record["method"]).observe(response_time / 1000)
+
+        for observer in _observers:
+            try:
+                observer(record)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro em observador de requisições: {str(e)}")
+
+        sampled = response_time >= REQUEST_LOG_ALWAYS_SLOW_MS or status_code >= 500
+        if not sampled and self.sample_rate < 1.0:
+            if self.sample_rate == 0.0 or random.random() >= self.sample_rate:
+                return
+
+        record["timestamp"] = datetime.utcnow()
+        record["weight"] = 1.0 if sampled or self.sample_rate == 1.0 else 1.0 / self.sample_rate
+        await self.sink.submit(record)
+
+
+async def start_request_logging():
+    """
+    Inicia a gravação em lote de `api_logs` (chamado no startup da aplicação).
+    """
+    await api_log_sink.start()
+
+async def stop_request_logging():
+    """
+    Grava as medições pendentes e encerra o buffer (chamado no shutdown da aplicação).
+    """
+    await api_log_sink.stop()
@@ -0,0 +1,300 @@
+# app/core/response_cache.py
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+from starlette.routing import Match, Route
+from app.core.cache import get_redis_cache
+from app.core.singleflight import SingleFlight
+
+# Configuração de logs
+logger = logging.getLogger("response_cache")
+logger.setLevel(logging.INFO)
+
+# Configuração do cache de respostas das rotas marcadas com `cache:{rota}`
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 30))  # Segundos em que a resposta é servida como fresca
+RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", 30))  # Segundos extras servindo a versão antiga enquanto renova
+RESPONSE_CACHE_MAX_BODY = int(os.getenv("RESPONSE_CACHE_MAX_BODY", 1024 * 1024))  # Respostas maiores não são guardadas
+RESPONSE_CACHE_FLAG_REFRESH = float(os.getenv("RESPONSE_CACHE_FLAG_REFRESH", 5))  # Segundos entre consultas de cada flag
+
+CACHE_FLAG_PREFIX = "cache:"
+RESPONSE_KEY_PREFIX = "response:"
+_SKIPPED_HEADERS = {b"etag", b"x-cache", b"set-cookie"}
+
+
+def cache_flag_key(route: str) -> str:
+    """
+    Chave da flag que ativa o cache de uma rota (gravada por `apply_cache_optimization`).
+    """
+    return f"{CACHE_FLAG_PREFIX}{route}"
+
+
+def response_cache_key(route: str, scope: Dict[str, Any]) -> str:
+    """
+    Chave da resposta: rota declarada + caminho e query normalizada + escopo de autenticação
+    (hash do cabeçalho Authorization), para que respostas de um usuário não sirvam a outro.
+    """
+    query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+    authorization = next((value for name, value in scope.get("headers", []) if name == b"authorization"), b"")
+    auth_scope = hashlib.sha256(authorization).hexdigest()[:16] if authorization else "anon"
+    request_hash = hashlib.sha256(f"{scope['path']}?{query}".encode()).hexdigest()[:24]
+    return f"{RESPONSE_KEY_PREFIX}{route}:{auth_scope}:{request_hash}"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _cacheable(response: Dict[str, Any]) -> bool:
+    if response["status"] != 200 or response["too_large"]:
+        return False
+    return not any(name == b"set-cookie" for name, _ in response["headers"])
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI que guarda no Redis as respostas GET das rotas com a flag `cache:{rota}` ativa.
+
+    - A resposta é fresca por `RESPONSE_CACHE_TTL` (nunca além da expiração da flag) e, depois disso,
+      ainda é servida por `RESPONSE_CACHE_STALE_TTL` enquanto uma única renovação roda em segundo plano.
+    - Em um miss, a primeira requisição executa a rota normalmente e as simultâneas com a mesma chave
+      aguardam e reutilizam o resultado.
+    - Respostas cacheáveis levam ETag desde o miss; `If-None-Match` compatível recebe 304 sem corpo.
+    Falhas do Redis não afetam a requisição: ela segue para a rota sem cache.
+    """
+
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+        self._flags: Dict[str, Tuple[float, float]] = {}  # rota -> (ms restantes da flag, consultado em)
+        self._filling: Dict[str, asyncio.Future] = {}
+        self._refreshes = SingleFlight()
+        self._background: Set[asyncio.Task] = set()  # Referências às renovações em andamento
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._match_route(scope)
+        flag_ttl = await self._flag_ttl(route) if route else None
+        if flag_ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = response_cache_key(route, scope)
+        try:
+            entry = await self._load(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de respostas indisponível: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        if entry is not None and now < entry["fresh_until"]:
+            await self._reply(entry, scope, send, "HIT")
+            return
+        if entry is not None and now < entry["stale_until"]:
+            if not self._refreshes.in_flight(key):
+                task = asyncio.create_task(self._refreshes.do(key, lambda: self._refresh(dict(scope), key, flag_ttl)))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            await self._reply(entry, scope, send, "STALE")
+            return
+
+        filling = self._filling.get(key)
+        if filling is not None:
+            entry = await asyncio.shield(filling)
+            if entry is not None:
+                await self._reply(entry, scope, send, "HIT")
+                return
+            await self.app(scope, receive, send)
+            return
+
+        await self._fill(scope, receive, send, key, flag_ttl)
+
+    def _match_route(self, scope) -> Optional[str]:
+        """
+        Resolve a rota declarada antes do roteador, como ele faria, e a publica em `scope["route"]`
+        (o RequestTimingMiddleware usa esse campo mesmo quando a resposta vem do cache).
+        Aplicações montadas (Mount) não são elegíveis.
+        """
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                if not isinstance(route, Route):
+                    return None
+                scope["route"] = route
+                return route.path
+        return None
+
+    async def _flag_ttl(self, route: str) -> Optional[float]:
+        """
+        Segundos restantes da flag da rota (`inf` se ela não expira) ou None se o cache está desativado.
+        O resultado fica em memória por `RESPONSE_CACHE_FLAG_REFRESH` segundos.
+        """
+        cached = self._flags.get(route)
+        now = time.monotonic()
+        if cached is None or now - cached[1] > RESPONSE_CACHE_FLAG_REFRESH:
+            try:
+                redis_cache = await get_redis_cache()
+                pttl = await redis_cache.redis.pttl(cache_flag_key(route))
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao consultar flag de cache de '{route}': {str(e)}")
+                pttl = -2
+            cached = self._flags[route] = (pttl, now)
+
+        pttl, checked_at = cached
+        if pttl == -2:
+            return None
+        if pttl == -1:
+            return float("inf")
+        remaining = pttl / 1000 - (now - checked_at)
+        return remaining if remaining > 0 else None
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        redis_cache = await get_redis_cache()
+        raw = await redis_cache.redis.get(key)
+        return json.loads(raw) if raw else None
+
+    async def _store(self, key: str, response: Dict[str, Any], flag_ttl: float) -> Optional[Dict[str, Any]]:
+        """
+        Guarda uma resposta capturada se ela puder ser reutilizada. Retorna a entrada gravada.
+        """
+        if not _cacheable(response):
+            return None
+
+        body = response["body"]
+        fresh = min(RESPONSE_CACHE_TTL, flag_ttl)
+        now = time.time()
+        entry = {
+            "status": response["status"],
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response["headers"] if name.lower() not in _SKIPPED_HEADERS],
+            "body": base64.b64encode(body).decode("ascii"),
+            "etag": _etag(body),
+            "fresh_until": now + fresh,
+            "stale_until": now + fresh + RESPONSE_CACHE_STALE_TTL,
+        }
+        try:
+            redis_cache = await get_redis_cache()
+            await redis_cache.redis.set(key, json.dumps(entry), px=max(1, int((fresh + RESPONSE_CACHE_STALE_TTL) * 1000)))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao guardar resposta em cache: {str(e)}")
+        return entry
+
+    async def _fill(self, scope, receive, send, key: str, flag_ttl: float):
+        """
+        Miss: executa a rota repassando a resposta ao cliente enquanto a captura, e a publica
+        para as requisições simultâneas com a mesma chave.
+        """
+        filling = self._filling[key] = asyncio.get_running_loop().create_future()
+        entry = None
+        try:
+            response = await self._run(scope, receive, send)
+            entry = await self._store(key, response, flag_ttl)
+        finally:
+            self._filling.pop(key, None)
+            filling.set_result(entry)
+
+    async def _refresh(self, scope, key: str, flag_ttl: float):
+        """
+        Renova uma entrada vencida em segundo plano, sem cliente conectado.
+        """
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        try:
+            response = await self._run(scope, receive, None)
+            await self._store(key, response, flag_ttl)
+        except Exception as e:
+            logger.error(f"❌ Erro ao renovar resposta em cache '{key}': {str(e)}")
+
+    async def _run(self, scope, receive, send) -> Dict[str, Any]:
+        """
+        Executa a rota capturando status, cabeçalhos e corpo (até `RESPONSE_CACHE_MAX_BODY`).
+        Com `send`, a resposta também é repassada ao cliente: o início é retido até o corpo terminar,
+        para que a resposta do miss já leve o mesmo ETag das que virão do cache. Corpos acima do
+        limite são repassados à medida que são produzidos, sem ETag.
+        """
+        response: Dict[str, Any] = {"status": 500, "headers": [], "body": b"", "too_large": False}
+        chunks: List[bytes] = []
+        size = 0
+        held_start: Optional[Dict[str, Any]] = None
+
+        async def release_start(etag: Optional[str]):
+            nonlocal held_start
+            headers = response["headers"]
+            if etag is not None:
+                headers = [(name, value) for name, value in headers if name.lower() != b"etag"] + [(b"etag", etag.encode("latin-1"))]
+            await send({**held_start, "headers": headers + [(b"x-cache", b"MISS")]})
+            held_start = None
+
+        async def capture(message):
+            nonlocal size, held_start
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+                if send is not None:
+                    held_start = message
+                return
+
+            if message["type"] == "http.response.body" and not response["too_large"]:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > RESPONSE_CACHE_MAX_BODY:
+                    response["too_large"] = True
+                    if held_start is not None:
+                        # Repassa o que estava retido junto com este bloco e segue sem reter
+                        message = {**message, "body": b"".join(chunks) + chunk}
+                    chunks.clear()
+                else:
+                    chunks.append(chunk)
+                    if held_start is not None and message.get("more_body", False):
+                        return
+                    if held_start is not None:
+                        response["body"] = b"".join(chunks)
+                        await release_start(_etag(response["body"]) if _cacheable(response) else None)
+                        await send({**message, "body": response["body"]})
+                        return
+
+            if send is None:
+                return
+            if held_start is not None:
+                await release_start(None)
+            await send(message)
+
+        await self.app(scope, receive, capture)
+        if send is not None and held_start is not None:
+            # Rota que não enviou corpo
+            await release_start(None)
+        response["body"] = b"".join(chunks)
+        return response
+
+    async def _reply(self, entry: Dict[str, Any], scope, send, status: str):
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in entry["headers"]]
+        headers.append((b"etag", entry["etag"].encode("latin-1")))
+        headers.append((b"x-cache", status.encode("latin-1")))
+
+        if_none_match = next((value for name, value in scope.get("headers", []) if name == b"if-none-match"), None)
+        if if_none_match is not None and _etag_matches(if_none_match.decode("latin-1"), entry["etag"]):
+            headers = [(name, value) for name, value in headers if name.lower() not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": entry["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(entry["body"])})
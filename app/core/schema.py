@@ -0,0 +1,211 @@
+# app/core/schema.py
+
+import logging
+import os
+from typing import Dict, Any, List
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+# Configuração de logs
+logger = logging.getLogger("schema")
+logger.setLevel(logging.INFO)
+
+# Permite desativar a criação automática (ex.: réplicas sem permissão de DDL)
+SCHEMA_AUTO_CREATE_INDEXES = os.getenv("SCHEMA_AUTO_CREATE_INDEXES", "true").lower() == "true"
+
+# Retenção de `api_logs` (um documento por requisição amostrada); alterar o valor exige recriar o índice TTL
+API_LOGS_RETENTION_DAYS = int(os.getenv("API_LOGS_RETENTION_DAYS", 14))
+
+# Índices declarados para as consultas quentes de cada coleção.
+# Listagens paginadas por keyset usam `(campo, _id)` para desempatar registros.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "modules": [
+        IndexModel([("name", ASCENDING)], unique=True),
+        IndexModel([("parent_module", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "module_versions": [
+        IndexModel([("module_name", ASCENDING), ("timestamp", DESCENDING)]),
+    ],
+    "versioning": [
+        IndexModel([("module_name", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "logs": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("log_type", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        # Busca de logs (app/services/log_search.py): texto livre e filtros por campo
+        IndexModel(
+            [("event", TEXT), ("mensagem", TEXT)],
+            name="logs_text",
+            weights={"event": 1, "mensagem": 1},
+            default_language="portuguese",
+        ),
+        IndexModel([("origem", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("usuario_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("level", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("nivel", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "log_rollups": [
+        IndexModel([("granularity", ASCENDING), ("bucket", ASCENDING)], unique=True),
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "latency_sketches": [
+        IndexModel([("window", ASCENDING), ("route", ASCENDING)], unique=True),
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "api_logs": [
+        IndexModel([("route", ASCENDING), ("response_time", DESCENDING)]),
+        IndexModel([("response_time", DESCENDING)]),
+        # Exportação NDJSON (app/services/export_service.py) percorre em `(timestamp, _id)`
+        IndexModel([("timestamp", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("timestamp", ASCENDING)], expireAfterSeconds=API_LOGS_RETENTION_DAYS * 86400),
+    ],
+    "auth_logs": [
+        IndexModel([("status", ASCENDING), ("timestamp", DESCENDING)]),
+    ],
+    "access_logs": [
+        IndexModel([("module_accessed", ASCENDING), ("timestamp", DESCENDING)]),
+    ],
+    "chat_history": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "ai_decisions": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "ai_optimizations": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ],
+    "fine_tuning_history": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "deploys": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "frontend_sync": [
+        IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "frontend": [
+        IndexModel([("name", ASCENDING)], unique=True),
+    ],
+    "blocked_ips": [
+        IndexModel([("ip_address", ASCENDING)]),
+    ],
+}
+
+# Opções de índice relevantes para detectar divergências
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights")
+
+
+def _index_key(key) -> tuple:
+    """
+    Normaliza a especificação de chave de um índice para comparação.
+    Campos de texto são gravados pelo MongoDB como `_fts`/`_ftsx`.
+    """
+    if isinstance(key, dict):
+        key = key.items()
+
+    fields = []
+    for field, direction in key:
+        if direction == TEXT:
+            if ("_fts", TEXT) not in fields:
+                fields.extend([("_fts", TEXT), ("_ftsx", 1)])
+            continue
+        fields.append((field, direction))
+    return tuple(fields)
+
+
+def _index_options(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extrai somente as opções que alteram o comportamento do índice.
+    """
+    options = {option: spec[option] for option in _COMPARED_OPTIONS if spec.get(option) is not None}
+    if options.get("unique") is False:
+        options.pop("unique")
+    return options
+
+
+async def check_collection_indexes(db, collection: str, declared: List[IndexModel]) -> Dict[str, Any]:
+    """
+    Compara os índices declarados com os existentes em uma coleção.
+    """
+    existing = await db[collection].index_information()
+    existing_by_key = {_index_key(spec["key"]): (name, spec) for name, spec in existing.items()}
+    declared_keys = set()
+
+    missing, conflicts = [], []
+    for index in declared:
+        document = index.document
+        key = _index_key(document["key"])
+        declared_keys.add(key)
+
+        if key not in existing_by_key:
+            missing.append(index)
+            continue
+
+        name, spec = existing_by_key[key]
+        expected, found = _index_options(document), _index_options(spec)
+        if expected != found:
+            conflicts.append({"index": name, "expected": expected, "found": found})
+
+    undeclared = [
+        name for key, (name, _) in existing_by_key.items()
+        if key not in declared_keys and name != "_id_"
+    ]
+
+    return {"missing": missing, "conflicts": conflicts, "undeclared": undeclared}
+
+
+async def bootstrap_schema(db, create_missing: bool = SCHEMA_AUTO_CREATE_INDEXES) -> Dict[str, Any]:
+    """
+    Cria os índices declarados que ainda não existem e reporta divergências no boot.
+    Índices conflitantes ou não declarados são apenas reportados, nunca removidos.
+    """
+    report = {"created": {}, "missing": {}, "conflicts": {}, "undeclared": {}, "errors": {}}
+
+    for collection, declared in INDEXES.items():
+        try:
+            drift = await check_collection_indexes(db, collection, declared)
+        except OperationFailure as e:
+            report["errors"][collection] = str(e)
+            continue
+
+        if drift["conflicts"]:
+            report["conflicts"][collection] = drift["conflicts"]
+        if drift["undeclared"]:
+            report["undeclared"][collection] = drift["undeclared"]
+
+        missing = drift["missing"]
+        if not missing:
+            continue
+
+        if not create_missing:
+            report["missing"][collection] = [index.document["name"] for index in missing]
+            continue
+
+        try:
+            report["created"][collection] = await db[collection].create_indexes(missing)
+        except OperationFailure as e:
+            # Ex.: índice único sobre dados duplicados — a API continua subindo
+            report["errors"][collection] = str(e)
+
+    for collection, names in report["created"].items():
+        logger.info(f"🧱 Índices criados em '{collection}': {', '.join(names)}")
+    for collection, names in report["missing"].items():
+        logger.warning(f"⚠️ Índices ausentes em '{collection}': {', '.join(names)}")
+    for collection, conflicts in report["conflicts"].items():
+        for conflict in conflicts:
+            logger.warning(
+                f"⚠️ Índice '{conflict['index']}' em '{collection}' diverge do declarado: "
+                f"esperado {conflict['expected']}, encontrado {conflict['found']}"
+            )
+    for collection, names in report["undeclared"].items():
+        logger.info(f"ℹ️ Índices não declarados em '{collection}': {', '.join(names)}")
+    for collection, error in report["errors"].items():
+        logger.error(f"❌ Erro ao preparar índices de '{collection}': {error}")
+
+    return report
@@ -3,12 +3,13 @@
 import os
 import jwt
 import logging
-import bcrypt
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from app.core.database import get_redis
+from app.core.hashing import password_hasher, HashingPoolBusy
+from app.core.metrics import JWT_DURATION
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -32,7 +33,8 @@ async def create_access_token(user_id: str, role: str):
     """
     expiration = datetime.utcnow() + timedelta(minutes=JWT_EXPIRATION_MINUTES)
     payload = {"sub": user_id, "role": role, "exp": expiration}
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    with JWT_DURATION.labels("encode").time():
+        token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return token
 
 async def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(security)):
@@ -41,23 +43,39 @@ async def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(
     """
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        with JWT_DURATION.labels("decode").time():
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado.")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Token inválido.")
 
+async def _run_hashing(operation):
+    """
+    Executa uma operação do pool de hashing, convertendo a fila cheia em HTTP 503.
+    """
+    try:
+        return await operation
+    except HashingPoolBusy:
+        logger.warning("🚨 Pool de hashing saturado, rejeitando requisição.")
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado processando autenticações. Tente novamente em instantes.",
+            headers={"Retry-After": "1"}
+        )
+
 async def hash_password(password: str):
     """
-    Hash da senha usando bcrypt.
+    Hash da senha usando bcrypt, executado fora do event loop.
     """
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode(), salt)
-    return hashed.decode()
+    return await _run_hashing(password_hasher.hash(password))
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """
+    Verifica a senha usando bcrypt, executado fora do event loop.
+    """
+    return await _run_hashing(password_hasher.verify(plain_password, hashed_password))
 
 
 async def is_ip_blocked(ip_address: str):
@@ -109,8 +127,7 @@ async def is_token_blacklisted(token: str):
         raise HTTPException(status_code=401, detail="Token inválido ou expirado.")
 
 async def get_password_hash(password: str) -> str:
-    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-    return hashed.decode('utf-8')
+    return await hash_password(password)
 
 async def admin_required(credentials: HTTPAuthorizationCredentials = Security(security)):
     """
@@ -118,7 +135,8 @@ async def admin_required(credentials: HTTPAuthorizationCredentials = Security(se
     """
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        with JWT_DURATION.labels("decode").time():
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         if payload.get("role") != "admin":
             raise HTTPException(status_code=403, detail="Acesso negado: somente administradores podem acessar esta rota.")
         return payload
@@ -0,0 +1,29 @@
+# app/core/singleflight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesce chamadas concorrentes com a mesma chave em uma única execução.
+    A execução roda em uma task própria: se quem a iniciou for cancelado
+    (ex.: cliente desconectou), os demais continuam aguardando o resultado.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `factory()` uma vez por chave; chamadas simultâneas recebem o mesmo resultado.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
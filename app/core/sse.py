@@ -0,0 +1,29 @@
+# app/core/sse.py
+
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+from fastapi.responses import StreamingResponse
+
+# Cabeçalhos que evitam buffering em proxies (ex.: nginx) e caches intermediários
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Formata um evento Server-Sent Events com o payload serializado em JSON.
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {payload}\n\n"
+
+
+async def _encode_events(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    async for event, data in events:
+        yield format_sse(data, event)
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    """
+    Converte um gerador assíncrono de pares `(evento, dados)` em uma resposta SSE.
+    """
+    return StreamingResponse(_encode_events(events), media_type="text/event-stream", headers=SSE_HEADERS)
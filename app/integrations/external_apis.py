@@ -1,7 +1,13 @@
 # app/integrations/external_apis.py
 
-import requests
+import httpx
 from fastapi import APIRouter, HTTPException
+from app.core.http_client import http_client
+from app.core.singleflight import SingleFlight
+from app.core.sse import sse_response
+from app.integrations.llm_cache import prompt_cache_key, get_cached_response, store_response
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import json
 import os
 
 router = APIRouter()
@@ -9,20 +15,107 @@ router = APIRouter()
 OPENAI_API_KEY = os.getenv("AI_API_KEY")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
+# URLs base configuráveis (permitem apontar para servidores locais em testes)
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+# Coalescência de prompts idênticos em andamento neste processo
+_inflight_completions = SingleFlight()
+
+async def _request_completion(payload: Dict[str, Any], cache_key: str, store: bool) -> Dict[str, Any]:
+    """
+    Chama o endpoint de chat completions do OpenAI e grava a resposta no cache.
+    """
+    headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
+
+    try:
+        response = await http_client.post(f"{OPENAI_API_BASE}/chat/completions", json=payload, headers=headers)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=500, detail="Erro ao se conectar ao OpenAI.")
+
+    if response.status_code != 200:
+        raise HTTPException(status_code=500, detail="Erro ao se conectar ao OpenAI.")
+
+    data = response.json()
+    if store:
+        await store_response(cache_key, data)
+    return data
+
+async def complete_chat(messages: List[Dict[str, Any]], model: str = "gpt-4o", use_cache: bool = True, **params) -> Dict[str, Any]:
+    """
+    Obtém uma resposta do modelo, servindo do cache quando possível.
+    Prompts idênticos simultâneos geram uma única chamada ao OpenAI.
+    """
+    payload = {"model": model, "messages": messages, **params}
+    cache_key = prompt_cache_key(payload)
+
+    if use_cache:
+        cached = await get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+    return await _inflight_completions.do(cache_key, lambda: _request_completion(payload, cache_key, use_cache))
+
 @router.post("/openai")
-async def generate_text(prompt: str):
+async def generate_text(prompt: str, use_cache: bool = True):
     """
     Envia um prompt para o OpenAI e retorna a resposta gerada.
     """
+    return await complete_chat([{"role": "user", "content": prompt}], use_cache=use_cache)
+
+async def stream_chat_completion(messages: List[Dict[str, Any]], model: str = "gpt-4o", **params) -> AsyncIterator[str]:
+    """
+    Solicita a resposta do modelo em streaming e gera os trechos de texto à medida que chegam.
+    Uma resposta já cacheada para o mesmo prompt é entregue de uma vez, sem chamar o OpenAI.
+    """
+    payload = {"model": model, "messages": messages, **params}
+
+    cached = await get_cached_response(prompt_cache_key(payload))
+    if cached is not None:
+        content = cached.get("choices", [{}])[0].get("message", {}).get("content")
+        if content:
+            yield content
+            return
+
     headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
-    payload = {"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}]}
+    payload["stream"] = True
 
-    response = requests.post("https://api.openai.com/v1/chat/completions", json=payload, headers=headers)
-    
-    if response.status_code != 200:
+    try:
+        async with http_client.stream("POST", f"{OPENAI_API_BASE}/chat/completions", json=payload, headers=headers) as response:
+            if response.status_code != 200:
+                raise HTTPException(status_code=500, detail="Erro ao se conectar ao OpenAI.")
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                choices = json.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+    except httpx.HTTPError:
         raise HTTPException(status_code=500, detail="Erro ao se conectar ao OpenAI.")
 
-    return response.json()
+async def _stream_text_events(prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+    parts = []
+    try:
+        async for content in stream_chat_completion([{"role": "user", "content": prompt}]):
+            parts.append(content)
+            yield "token", {"content": content}
+    except HTTPException as e:
+        yield "error", {"detail": e.detail}
+        return
+    yield "done", {"content": "".join(parts)}
+
+@router.post("/openai/stream")
+async def generate_text_stream(prompt: str):
+    """
+    Envia um prompt para o OpenAI e transmite a resposta via Server-Sent Events à medida que é gerada.
+    """
+    return sse_response(_stream_text_events(prompt))
 
 @router.get("/github/repos")
 async def list_github_repos():
@@ -30,7 +123,11 @@ async def list_github_repos():
     Retorna uma lista de repositórios do usuário autenticado no GitHub.
     """
     headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
-    response = requests.get("https://api.github.com/user/repos", headers=headers)
+
+    try:
+        response = await http_client.get(f"{GITHUB_API_BASE}/user/repos", headers=headers)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=500, detail="Erro ao obter repositórios do GitHub.")
 
     if response.status_code != 200:
         raise HTTPException(status_code=500, detail="Erro ao obter repositórios do GitHub.")
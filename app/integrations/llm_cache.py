@@ -0,0 +1,85 @@
+# app/integrations/llm_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from app.core.cache import get_redis_cache
+
+# Configuração de logs
+logger = logging.getLogger("llm_cache")
+logger.setLevel(logging.INFO)
+
+# Configuração do cache de respostas do modelo
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 300))  # Segundos
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+
+_KEY_PREFIX = "llm_cache:"
+_INDEX_KEY = "llm_cache:index"  # Sorted set chave -> instante de gravação, usado na evicção
+
+# Parâmetros que não alteram a resposta do modelo
+_IGNORED_PARAMS = {"stream", "user"}
+
+
+def _normalize_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return " ".join(content.split())
+    return content
+
+
+def prompt_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Gera a chave do cache a partir de um hash normalizado de modelo, mensagens e parâmetros.
+    """
+    normalized = {
+        key: value for key, value in payload.items()
+        if key not in _IGNORED_PARAMS and key != "messages"
+    }
+    normalized["messages"] = [
+        {"role": message.get("role"), "content": _normalize_content(message.get("content"))}
+        for message in payload.get("messages", [])
+    ]
+    digest = hashlib.sha256(
+        json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+    ).hexdigest()
+    return f"{_KEY_PREFIX}{digest}"
+
+
+async def get_cached_response(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Retorna a resposta cacheada para a chave, ou None.
+    """
+    try:
+        redis_cache = await get_redis_cache()
+        cached = await redis_cache.get_cache(key)
+        return json.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"⚠️ Cache de respostas indisponível: {str(e)}")
+        return None
+
+
+async def store_response(key: str, response: Dict[str, Any], ttl: int = LLM_CACHE_TTL):
+    """
+    Grava a resposta no cache e remove as entradas mais antigas acima de `LLM_CACHE_MAX_ENTRIES`.
+    """
+    try:
+        redis_cache = await get_redis_cache()
+        async with redis_cache.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, json.dumps(response))
+            pipe.zadd(_INDEX_KEY, {key: time.time()})
+            pipe.zremrangebyscore(_INDEX_KEY, "-inf", time.time() - ttl)  # Entradas já expiradas
+            pipe.zcard(_INDEX_KEY)
+            *_, size = await pipe.execute()
+
+        excess = size - LLM_CACHE_MAX_ENTRIES
+        if excess > 0:
+            oldest = await redis_cache.redis.zrange(_INDEX_KEY, 0, excess - 1)
+            if oldest:
+                async with redis_cache.redis.pipeline(transaction=False) as pipe:
+                    pipe.delete(*oldest)
+                    pipe.zrem(_INDEX_KEY, *oldest)
+                    await pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Falha ao gravar resposta no cache: {str(e)}")
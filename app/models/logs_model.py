@@ -24,3 +24,11 @@ class LogQueryParams(BaseModel):
     usuario_id: Optional[str] = None  # Filtra logs por usuário específico
     data_inicio: Optional[datetime] = None  # Filtra logs a partir de uma data
     data_fim: Optional[datetime] = None  # Filtra logs até uma data específica
+
+class LogSearchParams(LogQueryParams):
+    """
+    Parâmetros da busca de logs: texto livre, filtros de LogQueryParams e paginação.
+    """
+    q: Optional[str] = None  # Texto buscado em `event`/`mensagem`
+    limit: int = 50
+    cursor: Optional[str] = None  # Token de continuação retornado pela página anterior
@@ -3,6 +3,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.core.security import admin_required
 from app.core.database import get_database
+from app.services.counters import get_counts
+from app.services.admin_manager import get_system_config as load_system_config
+from app.core.cache import CACHE_TAG_SYSTEM_CONFIG, invalidate_cache_tags
 from app.core.security import admin_required
 
 router = APIRouter()
@@ -12,16 +15,15 @@ async def get_admin_dashboard():
     """
     Retorna estatísticas do sistema para o painel administrativo.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await`
     try:
-        user_count = await db["users"].count_documents({})
-        module_count = await db["modules"].count_documents({})
-        log_count = await db["logs"].count_documents({})
+        # Contadores mantidos no Redis (app/services/counters.py), sem varrer as coleções
+        counts = await get_counts("users", "modules", "logs")
 
         return {
-            "users": user_count,
-            "modules": module_count,
-            "logs": log_count,
+            "users": counts["users"],
+            "modules": counts["modules"],
+            "logs": counts["logs"],
+            "estimated": counts["estimated"],
             "status": "Painel Administrativo Online"
         }
     except Exception as e:
@@ -35,6 +37,7 @@ async def update_system_config(config_data: dict, user=Depends(admin_required)):
     db = await get_database()  # 🔹 Correção: Adicionado `await`
     try:
         await db["system_config"].update_one({}, {"$set": config_data}, upsert=True)
+        await invalidate_cache_tags(CACHE_TAG_SYSTEM_CONFIG)
         return {"response": "Configurações atualizadas com sucesso!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao atualizar configurações: {str(e)}")
@@ -44,9 +47,8 @@ async def get_system_config():
     """
     Retorna as configurações globais do sistema.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await`
     try:
-        config = await db["system_config"].find_one() or {}
+        config = await load_system_config()
         return {"response": "Configurações do sistema", "config": config}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao obter configurações: {str(e)}")
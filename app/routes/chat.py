@@ -1,7 +1,10 @@
 # Caminho: app/routes/chat.py
 
 from fastapi import APIRouter, HTTPException
-from app.services.chat_assistant import process_chat_request
+from app.services.chat_assistant import process_chat_request, stream_chat_request
+from app.core.sse import sse_response
+from app.services.session_context import resolve_session_id
+from app.services.chat_search import search_chat_history
 from datetime import datetime
 from typing import Dict, Any
 
@@ -14,6 +17,25 @@ async def chat_with_ai(request: Dict[str, Any]):
     if not user_message:
         raise HTTPException(status_code=400, detail="A mensagem não pode estar vazia.")
 
-    response = await process_chat_request(user_message)
+    session_id = resolve_session_id(request.get("session_id"))
+    response = await process_chat_request(user_message, session_id)
 
-    return {"response": response, "timestamp": datetime.utcnow()}
+    return {"response": response, "session_id": session_id, "timestamp": datetime.utcnow()}
+
+@router.post("/message/stream")
+async def chat_with_ai_stream(request: Dict[str, Any]):
+    """Versão em streaming (Server-Sent Events) do envio de mensagens ao Chat Assistente."""
+    user_message = request.get("message", "").strip()
+    if not user_message:
+        raise HTTPException(status_code=400, detail="A mensagem não pode estar vazia.")
+
+    session_id = resolve_session_id(request.get("session_id"))
+    return sse_response(stream_chat_request(user_message, session_id))
+
+@router.get("/search")
+async def search_chat(q: str, limit: int = 20):
+    """Busca no histórico do chat por relevância (BM25)."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="A consulta não pode estar vazia.")
+
+    return await search_chat_history(q, limit)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 from app.core.database import get_database
+from app.core.cache import CACHE_TAG_MODULES, cached
 from app.models.frontend_model import FrontendComponent
 
 router = APIRouter()
@@ -11,11 +12,14 @@ async def sync_frontend():
     """
     Retorna os componentes do frontend com base nos módulos existentes.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    try:
-        modules = await db["modules"].find().to_list(None)
-        frontend_components = [{"name": mod["name"], "route": f"/{mod['name'].lower()}"} for mod in modules]
+    async def load_components():
+        db = await get_database()
+        modules = await db["modules"].find({}, {"name": 1}).to_list(None)
+        return [{"name": mod["name"], "route": f"/{mod['name'].lower()}"} for mod in modules]
 
+    try:
+        # Invalidado pela tag de módulos a cada criação, atualização ou remoção
+        frontend_components = await cached("frontend_sync:components", load_components, tags=[CACHE_TAG_MODULES])
         return {"response": "Sincronização concluída!", "components": frontend_components}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao sincronizar frontend: {str(e)}")
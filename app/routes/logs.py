@@ -2,19 +2,24 @@
 
 from fastapi import APIRouter, HTTPException
 from app.core.database import get_database
+from app.core.pagination import paginate
+from app.services.logging_service import log_event
 from datetime import datetime
+from typing import Optional
 
 router = APIRouter()
 
 @router.get("/list")
-async def list_logs():
+async def list_logs(limit: int = 50, cursor: Optional[str] = None):
     """
-    Retorna os logs recentes do sistema.
+    Retorna os logs recentes do sistema, paginados por cursor.
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     try:
-        logs = await db["logs"].find().sort("timestamp", -1).limit(50).to_list(None)
-        return {"response": "Últimos logs coletados!", "logs": logs}
+        page = await paginate(db["logs"], limit=limit, cursor=cursor)
+        return {"response": "Últimos logs coletados!", "logs": page["items"], "next_cursor": page["next_cursor"]}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao listar logs: {str(e)}")
 
@@ -23,10 +28,12 @@ async def register_log(event: str, level: str = "INFO"):
     """
     Registra um novo log no sistema.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     try:
-        log_data = {"event": event, "level": level, "timestamp": datetime.utcnow()}
-        await db["logs"].insert_one(log_data)
+        result = await log_event(event, level)
+        if "error" in result:
+            raise HTTPException(status_code=503, detail=result["error"])
         return {"response": "Log registrado com sucesso!"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao registrar log: {str(e)}")
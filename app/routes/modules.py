@@ -2,6 +2,10 @@
 
 from fastapi import APIRouter, HTTPException
 from app.core.database import get_database
+from pymongo.errors import DuplicateKeyError
+from app.services.module_repository import get_module_by_name, invalidate_module
+from app.services.counters import increment_counter
+from app.core.cache import CACHE_TAG_MODULES, invalidate_cache_tags
 from app.models.module_model import ModuleEntry as Module
 from app.services.versioning_service import create_version, get_version_history, version_project
 
@@ -15,11 +19,18 @@ async def create_module(module: Module):
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    existing_module = await db["modules"].find_one({"name": module.name})
+    existing_module = await get_module_by_name(module.name)
     if existing_module:
         raise HTTPException(status_code=400, detail="Módulo já existe.")
 
-    await db["modules"].insert_one(module.dict())
+    try:
+        await db["modules"].insert_one(module.dict())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Módulo já existe.")
+    finally:
+        await invalidate_module(module.name)
+    await invalidate_cache_tags(CACHE_TAG_MODULES)
+    await increment_counter("modules")
     await version_project(module.name, "Criado novo módulo")  # 🔹 Correção: Agora `await`
 
     return {"response": f"Módulo {module.name} criado com sucesso!"}
@@ -31,11 +42,16 @@ async def update_module(module_name: str, update_data: dict):
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    module = await db["modules"].find_one({"name": module_name})
+    module = await get_module_by_name(module_name)
     if not module:
         raise HTTPException(status_code=404, detail="Módulo não encontrado.")
 
     await db["modules"].update_one({"name": module_name}, {"$set": update_data})  # 🔹 Correção: Garante atualização segura
+    await invalidate_module(module_name)
+    new_name = update_data.get("name")
+    if new_name and new_name != module_name:
+        await invalidate_module(new_name)  # Renomeado: descarta o cache negativo do novo nome
+    await invalidate_cache_tags(CACHE_TAG_MODULES)
     await version_project(module_name, "Atualizado módulo")  # 🔹 Correção: Agora `await`
 
     return {"response": f"Módulo {module_name} atualizado!"}
@@ -47,9 +63,12 @@ async def delete_module(module_name: str):
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    module = await db["modules"].find_one({"name": module_name})
+    module = await get_module_by_name(module_name)
     if not module:
         raise HTTPException(status_code=404, detail="Módulo não encontrado.")
 
-    await db["modules"].delete_one({"name": module_name})
+    result = await db["modules"].delete_one({"name": module_name})
+    await invalidate_module(module_name)
+    await invalidate_cache_tags(CACHE_TAG_MODULES)
+    await increment_counter("modules", -result.deleted_count)
     return {"response": f"Módulo {module_name} removido!"}
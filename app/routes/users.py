@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException
 from app.core.security import create_access_token, verify_password, get_password_hash
 from app.core.database import get_database
+from app.core.pagination import paginate
+from app.services.counters import increment_counter
 from app.models.user_model import UserCreate, UserDB
 from datetime import datetime
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
 import logging
 
 # Configuração de logs
@@ -22,12 +26,6 @@ async def register_user(user: UserCreate):
         logger.error("❌ Erro ao conectar ao banco de dados.")
         raise HTTPException(status_code=500, detail="Erro ao conectar ao banco de dados.")
 
-    # Verifica se a coleção 'users' existe
-    collections = await db.list_collection_names()
-    if "users" not in collections:
-        logger.warning("⚠️ Criando coleção 'users' no MongoDB...")
-        await db.create_collection("users")
-
     # Verifica se o usuário já está cadastrado
     existing_user = await db["users"].find_one({"email": user.email})
     if existing_user:
@@ -46,8 +44,12 @@ async def register_user(user: UserCreate):
         updated_at=datetime.utcnow()
     ).dict()
 
-    # Insere o usuário na coleção 'users'
-    await db["users"].insert_one(user_data)
+    # Insere o usuário na coleção 'users' (o índice único em `email` barra cadastros concorrentes)
+    try:
+        await db["users"].insert_one(user_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Usuário já cadastrado.")
+    await increment_counter("users")
     logger.info(f"✅ Novo usuário registrado: {user.email}")
     return {"response": "Usuário registrado com sucesso!"}
 
@@ -72,9 +74,9 @@ async def login_user(email: str, password: str):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/", summary="Lista todos os usuários cadastrados")
-async def list_users():
+async def list_users(limit: int = 50, cursor: Optional[str] = None):
     """
-    Retorna uma lista de usuários cadastrados.
+    Retorna uma página de usuários cadastrados, do mais recente ao mais antigo.
     """
     try:
         db = await get_database()
@@ -82,14 +84,12 @@ async def list_users():
         if db is None:
             raise HTTPException(status_code=500, detail="Erro ao conectar ao banco de dados.")
 
-        if "users" not in await db.list_collection_names():
-            logger.warning("⚠️ Nenhum usuário cadastrado ainda.")
-            return {"users": []}
-
         # Seleciona os dados dos usuários, omitindo a senha
-        users = await db["users"].find({}, {"_id": 0, "hashed_password": 0}).to_list(None)
-        return {"users": users}
+        page = await paginate(db["users"], projection={"_id": 0, "hashed_password": 0}, sort_field="created_at", limit=limit, cursor=cursor)
+        return {"users": page["items"], "next_cursor": page["next_cursor"]}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Erro ao listar usuários: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erro ao listar usuários: {str(e)}")
@@ -1,9 +1,16 @@
 # app/services/admin_manager.py
 
+import os
 from datetime import datetime
 from app.core.database import get_database
 from bson import ObjectId
 from typing import Dict, Any
+from app.core.pagination import clamp_page_size
+from app.services.counters import increment_counter, reset_counter
+from app.core.cache import CACHE_TAG_SYSTEM_CONFIG, cached, invalidate_cache_tags
+
+# Configuração do cache das configurações do sistema (invalidado pela tag a cada atualização)
+SYSTEM_CONFIG_CACHE_TTL = int(os.getenv("SYSTEM_CONFIG_CACHE_TTL", 600))
 
 async def update_system_config(config_updates: Dict[str, Any]):
     """
@@ -12,15 +19,27 @@ async def update_system_config(config_updates: Dict[str, Any]):
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
     await db["system_config"].update_one({}, {"$set": config_updates}, upsert=True)
+    await invalidate_cache_tags(CACHE_TAG_SYSTEM_CONFIG)
     return {"message": "Configurações do sistema atualizadas.", "updates": config_updates}
 
+async def get_system_config() -> Dict[str, Any]:
+    """
+    Retorna as configurações gerais do sistema (vazias se não houver), servidas do cache.
+    """
+    async def load():
+        db = await get_database()
+        return await db["system_config"].find_one({}, {"_id": 0}) or {}
+
+    return await cached("system_config:current", load, SYSTEM_CONFIG_CACHE_TTL, tags=[CACHE_TAG_SYSTEM_CONFIG])
+
 async def get_system_logs(limit: int = 50):
     """
     Retorna os logs administrativos e de sistema.
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    logs = await db["logs"].find().sort("timestamp", -1).limit(limit).to_list(None)
+    limit = clamp_page_size(limit)
+    logs = await db["logs"].find().sort("timestamp", -1).limit(limit).to_list(length=limit)
     return logs
 
 async def clear_logs():
@@ -30,6 +49,7 @@ async def clear_logs():
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
     result = await db["logs"].delete_many({})
+    await reset_counter("logs")
     return {"message": f"{result.deleted_count} logs removidos com sucesso!"}
 
 async def set_user_permission(user_id: str, role: str):
@@ -56,6 +76,7 @@ async def remove_user(user_id: str):
     result = await db["users"].delete_one({"_id": ObjectId(user_id)})
     if result.deleted_count == 0:
         return {"error": f"Usuário '{user_id}' não encontrado."}
+    await increment_counter("users", -1)
 
     return {"message": f"Usuário '{user_id}' removido com sucesso!"}
 
@@ -65,5 +86,6 @@ async def get_users_list(limit: int = 50):
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    users = await db["users"].find().sort("created_at", -1).limit(limit).to_list(None)
+    limit = clamp_page_size(limit)
+    users = await db["users"].find().sort("created_at", -1).limit(limit).to_list(length=limit)
     return users
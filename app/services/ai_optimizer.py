@@ -4,6 +4,7 @@ from datetime import datetime
 from app.core.database import get_database
 from typing import Dict, Any
 from fastapi import HTTPException
+from app.services.module_repository import get_module_by_name
 
 async def analyze_system() -> Dict[str, Any]:
     """
@@ -30,7 +31,7 @@ async def apply_optimization(module_name: str) -> Dict[str, Any]:
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
     # Verifica se o módulo existe antes de aplicar otimização
-    existing_module = await db["modules"].find_one({"name": module_name})
+    existing_module = await get_module_by_name(module_name)
     if not existing_module:
         raise HTTPException(status_code=404, detail=f"Módulo '{module_name}' não encontrado.")
 
@@ -1,67 +1,153 @@
 # app/services/chat_assistant.py
 
+import asyncio
+import logging
 from datetime import datetime
-from app.core.database import get_database
+from app.integrations.external_apis import complete_chat, stream_chat_completion
 from app.services.module_manager import create_module
+from app.services.module_repository import get_module_by_name
 from app.services.fine_tuning_manager import apply_fine_tuning
-from typing import Dict, Any
+from app.services.chat_transcript import record_turn
+from app.services.session_context import session_context
+from app.services.intent_resolver import ResolvedIntent, resolve_intent
+from app.services.intent_router import match_intent
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-async def process_chat_request(user_message: str) -> Dict[str, Any]:
+# Configuração de logs
+logger = logging.getLogger("chat_assistant")
+logger.setLevel(logging.INFO)
+
+UNKNOWN_REQUEST_MESSAGE = "Desculpe, não entendi sua solicitação. Poderia reformular?"
+
+# Instruções do modelo para respostas livres (mensagens que não são comandos)
+ASSISTANT_SYSTEM_PROMPT = (
+    "Você é o Chat Central, assistente do Admin para gestão de projetos e módulos. "
+    "Responda em português, de forma objetiva."
+)
+
+async def _handle_create_module(match: ResolvedIntent) -> Dict[str, Any]:
+    response = {}
+    module_name = match.slots.get("module_name")
+    if not module_name:
+        response["message"] = "Por favor, especifique o nome do módulo que deseja criar."
+        return response
+
+    existing_module = await get_module_by_name(module_name)
+    if existing_module:
+        response["message"] = f"O módulo '{module_name}' já existe. Deseja aprimorá-lo?"
+    else:
+        new_module = await create_module(module_name)  # 🔹 Correção: Agora `await`
+        response["message"] = f"Módulo '{module_name}' criado com sucesso!"
+        response["details"] = new_module
+    return response
+
+async def _handle_optimize_system(match: ResolvedIntent) -> Dict[str, Any]:
+    optimization_result = await apply_fine_tuning()  # 🔹 Correção: Agora `await`
+    return {"message": "Otimizações aplicadas com sucesso!", "details": optimization_result}
+
+# Executor de cada intenção do catálogo (app/services/intent_router.py), resolvida por
+# regras, cache ou classificador (app/services/intent_resolver.py)
+COMMAND_HANDLERS = {
+    "create_module": _handle_create_module,
+    "optimize_system": _handle_optimize_system,
+}
+
+async def execute_command(user_message: str) -> Optional[Dict[str, Any]]:
+    """
+    Identifica e executa o comando pedido na mensagem do Admin.
+    Retorna None quando nenhum comando é reconhecido.
+    """
+    match = await resolve_intent(user_message)
+    if match is None or match.intent not in COMMAND_HANDLERS:
+        return None
+    return await COMMAND_HANDLERS[match.intent](match)
+
+def _build_messages(context: List[Dict[str, str]], user_message: str) -> List[Dict[str, str]]:
+    return [{"role": "system", "content": ASSISTANT_SYSTEM_PROMPT}, *context, {"role": "user", "content": user_message}]
+
+async def process_chat_request(user_message: str, session_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Processa a mensagem do Admin e retorna uma resposta da IA baseada no contexto.
+    O contexto recente da sessão vem do Redis (app/services/session_context.py), não do histórico no MongoDB.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
     response = {}
-    
-    # Histórico para aprendizado contínuo
-    chat_log = {
-        "timestamp": datetime.utcnow(),
-        "user_message": user_message
-    }
-    
-    try:
-        # Analisando a intenção da mensagem
-        user_message_lower = user_message.lower()
-
-        if "criar módulo" in user_message_lower or "novo módulo" in user_message_lower:
-            module_name = extract_module_name(user_message)
-            if not module_name or module_name == "Modulo_Desconhecido":
-                response["message"] = "Por favor, especifique o nome do módulo que deseja criar."
-            else:
-                existing_module = await db["modules"].find_one({"name": module_name})
-
-                if existing_module:
-                    response["message"] = f"O módulo '{module_name}' já existe. Deseja aprimorá-lo?"
-                else:
-                    new_module = await create_module(module_name)  # 🔹 Correção: Agora `await`
-                    response["message"] = f"Módulo '{module_name}' criado com sucesso!"
-                    response["details"] = new_module
-
-        elif "otimizar sistema" in user_message_lower or "melhorar desempenho" in user_message_lower:
-            optimization_result = await apply_fine_tuning()  # 🔹 Correção: Agora `await`
-            response["message"] = "Otimizações aplicadas com sucesso!"
-            response["details"] = optimization_result
+    timestamp = datetime.utcnow()
 
+    try:
+        command_response = await execute_command(user_message)
+        if command_response is not None:
+            response = command_response
         else:
-            response["message"] = "Desculpe, não entendi sua solicitação. Poderia reformular?"
+            context = await session_context.get_context(session_id) if session_id else []
+            completion = await complete_chat(_build_messages(context, user_message))
+            content = completion.get("choices", [{}])[0].get("message", {}).get("content")
+            response = {"message": content or UNKNOWN_REQUEST_MESSAGE}
+    except Exception as e:
+        response["message"] = f"Erro ao processar a solicitação: {getattr(e, 'detail', str(e))}"
 
-        # Salvando no histórico do chat
-        chat_log["ai_response"] = response
-        await db["chat_history"].insert_one(chat_log)
+    if session_id:
+        await session_context.append_turn(session_id, user_message, response.get("message", ""))
+
+    # Histórico para aprendizado contínuo: uma única gravação por turno
+    if not await record_turn(user_message, response, timestamp, session_id):
+        logger.error("❌ Erro ao salvar histórico do chat: turno não gravado.")
 
-    except Exception as e:
-        response["message"] = f"Erro ao processar a solicitação: {str(e)}"
-    
     return response
 
+async def stream_chat_request(user_message: str, session_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Versão em streaming do processamento do chat, gerando eventos `(evento, dados)`.
+    Comandos reconhecidos geram um único evento `message`; as demais mensagens são
+    respondidas pelo modelo, com o contexto da sessão, trecho a trecho, em eventos `token`.
+    O primeiro evento (`session`) informa a sessão ao cliente. A transcrição final é gravada
+    no histórico quando o stream termina, mesmo se o cliente desconectar.
+    """
+    response = {}
+    timestamp = datetime.utcnow()
+
+    try:
+        if session_id:
+            yield "session", {"session_id": session_id}
+        command_response = await execute_command(user_message)
+        if command_response is not None:
+            response = command_response
+            yield "message", response
+        else:
+            parts = []
+            context = await session_context.get_context(session_id) if session_id else []
+            try:
+                async for content in stream_chat_completion(_build_messages(context, user_message)):
+                    parts.append(content)
+                    yield "token", {"content": content}
+            finally:
+                response["message"] = "".join(parts) or UNKNOWN_REQUEST_MESSAGE
+        yield "done", response
+    except Exception as e:
+        response["message"] = f"Erro ao processar a solicitação: {getattr(e, 'detail', str(e))}"
+        yield "error", response
+    finally:
+        # Uma única tarefa protegida: com o cliente desconectado o await é cancelado, mas as duas gravações seguem
+        await asyncio.shield(_persist_stream_turn(user_message, response, timestamp, session_id))
+
+async def _persist_stream_turn(user_message: str, response: Dict[str, Any], timestamp: datetime, session_id: Optional[str]):
+    """
+    Grava o turno do stream no contexto da sessão e no histórico, em paralelo e de forma independente.
+    """
+    writes = [record_turn(user_message, response, timestamp, session_id)]
+    if session_id:
+        writes.append(session_context.append_turn(session_id, user_message, response.get("message", "")))
+    results = await asyncio.gather(*writes, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"❌ Erro ao salvar histórico do chat: {str(result)}")
+    if results[0] is False:
+        logger.error("❌ Erro ao salvar histórico do chat: turno não gravado.")
+
 def extract_module_name(user_message: str) -> str:
     """
-    Extrai o nome do módulo da mensagem do Admin de forma mais robusta.
+    Extrai o nome do módulo da mensagem do Admin usando o roteador de intenções.
     """
-    words = user_message.split()
-    if "módulo" in words:
-        index = words.index("módulo") + 1
-        if index < len(words):
-            return words[index].strip(".,!?").capitalize()
+    match = match_intent(user_message)
+    if match and match.slots.get("module_name"):
+        return match.slots["module_name"]
     return "Modulo_Desconhecido"
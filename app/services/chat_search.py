@@ -0,0 +1,587 @@
+# app/services/chat_search.py
+
+import asyncio
+import fcntl
+import heapq
+import itertools
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import uuid
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from bson import ObjectId
+from app.core.database import get_database
+from app.services.chat_transcript import transcript_writer
+from app.services.intent_router import normalize_text
+
+# Configuração de logs
+logger = logging.getLogger("chat_search")
+logger.setLevel(logging.INFO)
+
+# Configuração do índice de busca do histórico do chat
+CHAT_SEARCH_INDEX_DIR = os.getenv("CHAT_SEARCH_INDEX_DIR", "storage/chat_index")
+CHAT_SEARCH_SEGMENT_DOCS = int(os.getenv("CHAT_SEARCH_SEGMENT_DOCS", 20000))  # Turnos em memória antes de gravar um segmento
+CHAT_SEARCH_MAX_POSTINGS = int(os.getenv("CHAT_SEARCH_MAX_POSTINGS", 1000))  # Postings de maior impacto avaliados por termo e segmento
+CHAT_SEARCH_SYNC_INTERVAL = float(os.getenv("CHAT_SEARCH_SYNC_INTERVAL", 10))  # Segundos entre sincronizações com o MongoDB
+CHAT_SEARCH_SYNC_OVERLAP = float(os.getenv("CHAT_SEARCH_SYNC_OVERLAP", 60))  # Atraso máximo entre gerar o `_id` de um turno e gravá-lo
+CHAT_SEARCH_MAX_RESULTS = 100
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+_STOPWORDS = {
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "no", "na", "nos", "nas",
+    "um", "uma", "para", "por", "com", "que", "se", "ao", "aos", "the", "and", "of", "to",
+}
+
+# Registro de documento no segmento: ObjectId, timestamp (epoch) e tamanho em termos
+_DOC_RECORD = struct.Struct("<12sdI")
+_MANIFEST = "manifest.json"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Quebra o texto em termos sem acentos e em minúsculas, ignorando stopwords.
+    """
+    return [token for token in _TOKEN_RE.findall(normalize_text(text)) if len(token) > 1 and token not in _STOPWORDS]
+
+
+def _document_text(document: Dict[str, Any]) -> str:
+    response = document.get("ai_response")
+    if isinstance(response, dict):
+        response = response.get("message", "")
+    return f"{document.get('user_message', '')} {response or ''}"
+
+
+def _epoch(timestamp: Any) -> float:
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return 0.0
+
+
+def _idf(doc_count: int, df: int) -> float:
+    return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+
+def _impact(frequency: int, length: int, average_length: float) -> float:
+    """
+    Parte do BM25 que depende do documento; multiplicada por `idf · (k1 + 1)` dá a contribuição do termo.
+    """
+    return frequency / (frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+
+
+class MemorySegment:
+    """
+    Segmento em construção, mantido em memória até atingir `CHAT_SEARCH_SEGMENT_DOCS` turnos.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.docs: List[Tuple[bytes, float, int]] = []
+        self.ids: Set[bytes] = set()
+        self.total_length = 0
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.docs)
+
+    def add(self, object_id: ObjectId, timestamp: float, tokens: List[str]):
+        doc_no = len(self.docs)
+        self.docs.append((object_id.binary, timestamp, len(tokens)))
+        self.ids.add(object_id.binary)
+        self.total_length += len(tokens)
+        for term, frequency in Counter(tokens).items():
+            self.postings.setdefault(term, []).append((doc_no, frequency))
+
+    def document_frequency(self, term: str) -> int:
+        return len(self.postings.get(term, ()))
+
+    def iter_postings(self, term: str, limit: int):
+        """
+        Os `limit` postings de maior impacto, na mesma ordem dos segmentos em disco.
+        """
+        postings = self.postings.get(term, ())
+        average_length = self.total_length / max(self.doc_count, 1)
+        return heapq.nlargest(limit, postings, key=lambda posting: _impact(posting[1], self.docs[posting[0]][2], average_length))
+
+    def doc(self, doc_no: int) -> Tuple[bytes, float, int]:
+        return self.docs[doc_no]
+
+
+class DiskSegment:
+    """
+    Segmento imutável em disco. O léxico (termo -> posição, df) fica em memória; postings e
+    documentos são lidos por mmap, sem carregar os arquivos inteiros.
+
+    Arquivos: `<nome>.lex` (JSON), `<nome>.post` (pares uint32 doc/tf, por termo ordenados pelo
+    impacto no BM25) e `<nome>.docs` (registros fixos `_DOC_RECORD`).
+    """
+
+    def __init__(self, directory: str, name: str, doc_count: int, total_length: int):
+        self.name = name
+        self.doc_count = doc_count
+        self.total_length = total_length
+        prefix = os.path.join(directory, name)
+
+        with open(f"{prefix}.lex", "r", encoding="utf-8") as lexicon_file:
+            self.lexicon: Dict[str, List[int]] = json.load(lexicon_file)
+
+        self._files, self._maps, self._views = [], [], []
+        self.postings = self._map(f"{prefix}.post", "I")
+        self.docs = self._map(f"{prefix}.docs", "B")
+
+    def _map(self, path: str, item_format: str) -> memoryview:
+        file = open(path, "rb")
+        self._files.append(file)
+        if os.fstat(file.fileno()).st_size == 0:
+            view = memoryview(b"")
+        else:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            view = memoryview(mapped)
+        self._views.append(view)
+        typed = view.cast(item_format)
+        self._views.append(typed)
+        return typed
+
+    def document_frequency(self, term: str) -> int:
+        entry = self.lexicon.get(term)
+        return entry[1] if entry else 0
+
+    def iter_postings(self, term: str, limit: int):
+        entry = self.lexicon.get(term)
+        if not entry:
+            return ()
+        offset, df = entry
+        values = self.postings[offset * 2:(offset + min(df, limit)) * 2]
+        return zip(values[0::2], values[1::2])
+
+    def doc(self, doc_no: int) -> Tuple[bytes, float, int]:
+        return _DOC_RECORD.unpack_from(self.docs, doc_no * _DOC_RECORD.size)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        for file in self._files:
+            file.close()
+
+    @staticmethod
+    def write(directory: str, name: str, segment: MemorySegment) -> Dict[str, Any]:
+        """
+        Grava um segmento em memória no formato em disco e retorna seus metadados.
+        """
+        prefix = os.path.join(directory, name)
+        average_length = segment.total_length / max(segment.doc_count, 1)
+
+        def impact(posting: Tuple[int, int]) -> float:
+            doc_no, frequency = posting
+            return _impact(frequency, segment.docs[doc_no][2], average_length)
+
+        lexicon, postings, offset = {}, array("I"), 0
+        for term in sorted(segment.postings):
+            entries = sorted(segment.postings[term], key=impact, reverse=True)
+            lexicon[term] = [offset, len(entries)]
+            for doc_no, frequency in entries:
+                postings.append(doc_no)
+                postings.append(frequency)
+            offset += len(entries)
+
+        with open(f"{prefix}.post", "wb") as postings_file:
+            postings.tofile(postings_file)
+        with open(f"{prefix}.docs", "wb") as docs_file:
+            for record in segment.docs:
+                docs_file.write(_DOC_RECORD.pack(*record))
+        with open(f"{prefix}.lex", "w", encoding="utf-8") as lexicon_file:
+            json.dump(lexicon, lexicon_file, separators=(",", ":"))
+
+        return {"name": name, "doc_count": segment.doc_count, "total_length": segment.total_length}
+
+
+class ChatSearchIndex:
+    """
+    Índice invertido BM25 sobre `chat_history` (mensagem do Admin + resposta da IA).
+    Turnos novos entram em um segmento em memória; ao atingir `segment_docs` turnos ele vira
+    um segmento imutável em disco, listado em `manifest.json`.
+
+    Cada worker mantém um índice completo em seu próprio diretório (`worker-N` dentro de
+    `CHAT_SEARCH_INDEX_DIR`, reservado com um lock de arquivo). Os turnos gravados pelo próprio
+    worker são indexados na hora (listener do `transcript_writer`); os dos demais chegam pela
+    sincronização periódica com o MongoDB por `_id` (`sync`).
+    """
+
+    def __init__(self, directory: str = CHAT_SEARCH_INDEX_DIR, segment_docs: int = CHAT_SEARCH_SEGMENT_DOCS):
+        self.base_directory = directory
+        self.directory: Optional[str] = None
+        self.segment_docs = segment_docs
+        self.segments: List[DiskSegment] = []
+        # Todo turno com `_id <= synced_floor` já está indexado; acima dele, os indexados ficam em `_recent`
+        self.synced_floor: Optional[ObjectId] = None
+        self._recent: Set[bytes] = set()
+        self._memory = MemorySegment()
+        self._persisting: List[MemorySegment] = []
+        self._lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._persist_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._directory_lock = None
+
+    @property
+    def doc_count(self) -> int:
+        return self._sum("doc_count")
+
+    def _sources(self) -> List[Any]:
+        return [*self.segments, *self._persisting, self._memory]
+
+    def _sum(self, attribute: str) -> int:
+        return sum(getattr(source, attribute) for source in self._sources())
+
+    def _claim_directory(self):
+        """
+        Reserva o primeiro `worker-N` livre com um lock exclusivo, mantido enquanto o processo viver.
+        Após um restart o worker volta a encontrar um índice já gravado e só sincroniza a diferença.
+        """
+        for slot in itertools.count():
+            directory = os.path.join(self.base_directory, f"worker-{slot}")
+            os.makedirs(directory, exist_ok=True)
+            lock_file = open(os.path.join(directory, ".lock"), "a")
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            self.directory, self._directory_lock = directory, lock_file
+            return
+
+    def load(self):
+        """
+        Reserva o diretório do worker e abre os segmentos listados no manifesto.
+        """
+        if self.directory is None:
+            self._claim_directory()
+        path = os.path.join(self.directory, _MANIFEST)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+        self.segments = [
+            DiskSegment(self.directory, entry["name"], entry["doc_count"], entry["total_length"])
+            for entry in manifest.get("segments", [])
+        ]
+        last_id = manifest.get("last_id")
+        self.synced_floor = ObjectId(last_id) if last_id else None
+        # Turnos gravados acima do piso (ex.: de outros workers, fora de ordem) não devem ser reindexados
+        floor = self.synced_floor.binary if self.synced_floor else b""
+        self._recent = {
+            record[0] for segment in self.segments for record in map(segment.doc, range(segment.doc_count)) if record[0] > floor
+        }
+        logger.info(f"✅ Índice de busca do chat carregado de '{self.directory}': {len(self.segments)} segmentos, {self.doc_count} turnos.")
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def release(self):
+        """
+        Libera o diretório do worker (chamado no shutdown, depois de `close`).
+        """
+        if self._directory_lock is not None:
+            self._directory_lock.close()
+            self._directory_lock = None
+            self.directory = None
+
+    async def add_documents(self, documents: List[Dict[str, Any]]):
+        """
+        Indexa turnos recém-gravados (usado como listener do `transcript_writer`).
+        """
+        await self._index(documents)
+
+    async def _index(self, documents: List[Dict[str, Any]]):
+        floor = self.synced_floor.binary if self.synced_floor else b""
+        for document in documents:
+            object_id = document.get("_id")
+            if not isinstance(object_id, ObjectId):
+                continue
+            key = object_id.binary
+            if key <= floor or key in self._recent:
+                continue
+            self._recent.add(key)
+            self._memory.add(object_id, _epoch(document.get("timestamp")), tokenize(_document_text(document)))
+
+        if self._memory.doc_count >= self.segment_docs and (self._persist_task is None or self._persist_task.done()):
+            # A gravação do segmento não segura o lote seguinte do `transcript_writer`
+            self._persist_task = asyncio.create_task(self.persist(), name="chat-search:persist")
+
+    def _advance_floor(self, candidate: ObjectId):
+        if self.synced_floor is not None and candidate <= self.synced_floor:
+            return
+        self.synced_floor = candidate
+        floor = candidate.binary
+        self._recent = {key for key in self._recent if key > floor}
+
+    def _persisted_floor(self, persisting: MemorySegment) -> Optional[ObjectId]:
+        """
+        Maior `_id` abaixo do qual todos os turnos estarão em segmentos gravados após gravar `persisting`:
+        o piso sincronizado, limitado pelo menor turno que continua só em memória.
+        """
+        floor = self.synced_floor
+        for segment in (self._memory, *self._persisting):
+            if segment is not persisting and segment.doc_count and floor is not None:
+                lowest = min(record[0] for record in segment.docs)
+                floor = min(floor, ObjectId((int.from_bytes(lowest, "big") - 1).to_bytes(12, "big")))
+        return floor
+
+    async def persist(self):
+        """
+        Grava o segmento em memória em disco (fora do event loop) e atualiza o manifesto.
+        """
+        async with self._lock:
+            segment = self._memory
+            if segment.doc_count == 0 or self.directory is None:
+                return
+            self._memory = MemorySegment()
+            self._persisting.append(segment)
+            last_id = self._persisted_floor(segment)
+
+            name = f"seg-{uuid.uuid4().hex[:12]}"
+            loop = asyncio.get_running_loop()
+            try:
+                meta = await loop.run_in_executor(None, DiskSegment.write, self.directory, name, segment)
+                manifest = {
+                    "segments": [
+                        *({"name": s.name, "doc_count": s.doc_count, "total_length": s.total_length} for s in self.segments),
+                        meta,
+                    ],
+                    "last_id": str(last_id) if last_id else None,
+                }
+                await loop.run_in_executor(None, self._write_manifest, manifest)
+                self.segments.append(DiskSegment(self.directory, name, meta["doc_count"], meta["total_length"]))
+            except Exception as e:
+                # O segmento continua pesquisável em memória e volta a ser gravado na próxima tentativa
+                logger.error(f"❌ Erro ao gravar segmento do índice de busca do chat: {str(e)}")
+                self._memory = _merge_memory(segment, self._memory)
+            finally:
+                self._persisting.remove(segment)
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        path = os.path.join(self.directory, _MANIFEST)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary, path)
+
+    async def sync(self, batch_size: int = 1000):
+        """
+        Indexa os turnos de `chat_history` acima do piso sincronizado, em ordem de `_id`: a primeira
+        carga, os que estavam só em memória quando o processo parou e os gravados por outros workers.
+        Um turno cujo `_id` foi gerado mais de `CHAT_SEARCH_SYNC_OVERLAP` segundos antes da passada
+        já está no MongoDB, então o piso avança até ele; os mais novos voltam a ser lidos na próxima
+        passada e são deduplicados por `_id`.
+        """
+        async with self._sync_lock:
+            settled = ObjectId.from_datetime(datetime.now(timezone.utc) - timedelta(seconds=CHAT_SEARCH_SYNC_OVERLAP))
+            db = await get_database()
+            query = {"_id": {"$gt": self.synced_floor}} if self.synced_floor else {}
+            cursor = db["chat_history"].find(query, {"user_message": 1, "ai_response": 1, "timestamp": 1}).sort("_id", 1)
+
+            batch, read = [], 0
+            try:
+                async for document in cursor:
+                    batch.append(document)
+                    if len(batch) >= batch_size:
+                        await self._index(batch)
+                        read += len(batch)
+                        self._advance_floor(min(batch[-1]["_id"], settled))
+                        batch = []
+                if batch:
+                    await self._index(batch)
+                    read += len(batch)
+            finally:
+                await cursor.close()
+            # Cursor esgotado: tudo o que foi gerado antes de `settled` foi lido
+            self._advance_floor(settled)
+        return read
+
+    async def _run_sync(self):
+        while True:
+            try:
+                read = await self.sync()
+                if read:
+                    logger.debug(f"🔄 Índice de busca do chat sincronizado: {read} turnos lidos.")
+            except Exception as e:
+                logger.error(f"❌ Erro ao sincronizar índice de busca do chat: {str(e)}")
+            await asyncio.sleep(CHAT_SEARCH_SYNC_INTERVAL)
+
+    async def start(self):
+        """
+        Inicia a sincronização periódica; a primeira passada recupera o que falta desde o último segmento.
+        """
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._run_sync(), name="chat-search:sync")
+
+    async def stop(self):
+        """
+        Encerra a sincronização periódica (chamado no shutdown, antes de `persist`).
+        """
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    def search(self, query: str, limit: int = 20, exhaustive: bool = False) -> List[Tuple[ObjectId, float, float]]:
+        """
+        Retorna `(id, timestamp, score)` dos turnos mais relevantes para a consulta, pelo BM25.
+        Roda fora do event loop (ver `search_chat_history`). `exhaustive=True` avalia todos os
+        postings, sem limite nem parada antecipada (referência para o benchmark).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        sources = self._sources()
+        doc_count = sum(source.doc_count for source in sources)
+        if not terms or doc_count == 0:
+            return []
+
+        idfs = {term: _idf(doc_count, sum(source.document_frequency(term) for source in sources)) for term in terms}
+        # Termos mais raros primeiro: elevam o limiar do top-k antes das listas longas
+        terms.sort(key=idfs.get, reverse=True)
+        max_postings = doc_count if exhaustive else CHAT_SEARCH_MAX_POSTINGS
+
+        top: List[Tuple[float, int, int]] = []
+        for source_index, source in enumerate(sources):
+            threshold = top[0][0] if len(top) >= limit and not exhaustive else 0.0
+            scores = self._score_source(source, terms, idfs, limit, threshold, max_postings, exhaustive)
+            for doc_no, score in scores.items():
+                entry = (score, source_index, doc_no)
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+        results = []
+        for score, source_index, doc_no in sorted(top, reverse=True):
+            object_id, timestamp, _ = sources[source_index].doc(doc_no)
+            results.append((ObjectId(object_id), timestamp, score))
+        return results
+
+    @staticmethod
+    def _score_source(source, terms: List[str], idfs: Dict[str, float], limit: int, threshold: float, max_postings: int, exhaustive: bool) -> Dict[int, float]:
+        """
+        Acumula o BM25 de um segmento termo a termo. Os postings vêm em ordem decrescente de impacto,
+        então a contribuição do posting atual limita a de todos os seguintes: quando ela, somada ao
+        máximo dos termos restantes, não supera o limiar do top-k, nenhum turno ainda não acumulado
+        pode entrar no resultado (poda no estilo MaxScore) e o restante da lista só completa os
+        scores já acumulados, sem criar entradas novas.
+        """
+        average_length = source.total_length / max(source.doc_count, 1)
+        lists = []
+        for term in terms:
+            postings = list(source.iter_postings(term, max_postings))
+            if postings:
+                weight = idfs[term] * (BM25_K1 + 1)
+                first_doc, first_frequency = postings[0]
+                lists.append((weight, postings, weight * _impact(first_frequency, source.doc(first_doc)[2], average_length)))
+
+        scores: Dict[int, float] = {}
+        for index, (weight, postings, _) in enumerate(lists):
+            remaining = sum(bound for _, _, bound in lists[index + 1:])
+            admitting = True
+            for doc_no, frequency in postings:
+                if not admitting and doc_no not in scores:
+                    continue
+                contribution = weight * _impact(frequency, source.doc(doc_no)[2], average_length)
+                if admitting and not exhaustive and contribution + remaining <= threshold:
+                    # Nenhum turno novo alcança o top-k daqui em diante; só os já acumulados somam
+                    admitting = False
+                    if doc_no not in scores:
+                        continue
+                scores[doc_no] = scores.get(doc_no, 0.0) + contribution
+            if not exhaustive and len(scores) >= limit:
+                # Os scores parciais já são limites inferiores: o k-ésimo maior também vale como limiar
+                threshold = max(threshold, heapq.nlargest(limit, scores.values())[-1])
+        return scores
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": len(self.segments),
+            "indexed_turns": self.doc_count,
+            "in_memory_turns": self._memory.doc_count,
+            "directory": self.directory,
+        }
+
+
+def _merge_memory(first: MemorySegment, second: MemorySegment) -> MemorySegment:
+    merged = MemorySegment()
+    for segment in (first, second):
+        for doc_no, (object_id, timestamp, length) in enumerate(segment.docs):
+            merged.docs.append((object_id, timestamp, length))
+            merged.ids.add(object_id)
+            merged.total_length += length
+        offset = len(merged.docs) - segment.doc_count
+        for term, entries in segment.postings.items():
+            merged.postings.setdefault(term, []).extend((doc_no + offset, frequency) for doc_no, frequency in entries)
+    return merged
+
+
+# Instância global do índice de busca do chat
+chat_search_index = ChatSearchIndex()
+
+async def start_chat_search():
+    """
+    Carrega o índice, passa a indexar os turnos gravados e recupera os que faltam (chamado no startup).
+    """
+    try:
+        chat_search_index.load()
+    except Exception as e:
+        logger.error(f"❌ Erro ao carregar índice de busca do chat: {str(e)}")
+        chat_search_index.close()
+    transcript_writer.add_flush_listener(chat_search_index.add_documents)
+    await chat_search_index.start()
+
+async def stop_chat_search():
+    """
+    Grava o segmento em memória e fecha os arquivos do índice (chamado no shutdown).
+    """
+    await chat_search_index.stop()
+    await chat_search_index.persist()
+    chat_search_index.close()
+    chat_search_index.release()
+
+async def search_chat_history(query: str, limit: int = 20) -> Dict[str, Any]:
+    """
+    Busca turnos do chat por relevância e retorna os documentos de `chat_history` com seu score.
+    """
+    limit = max(1, min(limit, CHAT_SEARCH_MAX_RESULTS))
+    # O BM25 é CPU puro: roda em uma thread para não travar as demais requisições do worker
+    hits = await asyncio.get_running_loop().run_in_executor(None, chat_search_index.search, query, limit)
+    if not hits:
+        return {"results": [], "indexed_turns": chat_search_index.doc_count}
+
+    db = await get_database()
+    documents = await db["chat_history"].find({"_id": {"$in": [object_id for object_id, _, _ in hits]}}).to_list(None)
+    by_id = {document["_id"]: document for document in documents}
+
+    results = []
+    for object_id, _, score in hits:
+        document = by_id.get(object_id)
+        if document is None:
+            continue
+        document["_id"] = str(document["_id"])
+        document["score"] = round(score, 4)
+        results.append(document)
+    return {"results": results, "indexed_turns": chat_search_index.doc_count}
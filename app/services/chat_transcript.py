@@ -0,0 +1,54 @@
+# app/services/chat_transcript.py
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.batch_writer import BatchWriter
+
+# Configuração da gravação do histórico do chat
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() == "true"  # Responde antes da gravação
+CHAT_WRITER_BATCH_SIZE = int(os.getenv("CHAT_WRITER_BATCH_SIZE", 200))
+CHAT_WRITER_FLUSH_INTERVAL = float(os.getenv("CHAT_WRITER_FLUSH_INTERVAL", 0))  # 0 = grava assim que a fila esvazia
+CHAT_WRITER_MAX_BUFFER = int(os.getenv("CHAT_WRITER_MAX_BUFFER", 5000))
+CHAT_WRITER_BLOCK_TIMEOUT = float(os.getenv("CHAT_WRITER_BLOCK_TIMEOUT", 1.0))  # Segundos
+
+# Buffer de gravação em lote da coleção `chat_history`: turnos simultâneos seguem no mesmo `insert_many`
+transcript_writer = BatchWriter(
+    "chat_history",
+    batch_size=CHAT_WRITER_BATCH_SIZE,
+    flush_interval=CHAT_WRITER_FLUSH_INTERVAL,
+    max_buffer=CHAT_WRITER_MAX_BUFFER,
+    block_timeout=CHAT_WRITER_BLOCK_TIMEOUT,
+)
+
+async def start_transcript_writer():
+    """
+    Inicia a gravação em lote do histórico do chat (chamado no startup da aplicação).
+    """
+    await transcript_writer.start()
+
+async def stop_transcript_writer():
+    """
+    Grava os turnos pendentes e encerra o buffer (chamado no shutdown da aplicação).
+    """
+    await transcript_writer.stop()
+
+async def record_turn(
+    user_message: str,
+    ai_response: Dict[str, Any],
+    timestamp: Optional[datetime] = None,
+    session_id: Optional[str] = None,
+) -> bool:
+    """
+    Grava um turno do chat (mensagem do Admin + resposta da IA) uma única vez em `chat_history`.
+    Por padrão aguarda a gravação do lote; com `CHAT_WRITE_BEHIND` retorna assim que o turno é enfileirado.
+    Retorna False se o turno não pôde ser gravado.
+    """
+    chat_log = {
+        "timestamp": timestamp or datetime.utcnow(),
+        "user_message": user_message,
+        "ai_response": ai_response
+    }
+    if session_id:
+        chat_log["session_id"] = session_id
+    return await transcript_writer.submit(chat_log, wait=not CHAT_WRITE_BEHIND)
@@ -0,0 +1,174 @@
+# app/services/counters.py
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+from app.core.cache import get_redis_cache
+from app.core.database import get_database
+
+# Configuração de logs
+logger = logging.getLogger("counters")
+logger.setLevel(logging.INFO)
+
+# Intervalo da reconciliação com o MongoDB, que corrige desvios dos contadores
+COUNTERS_RECONCILE_INTERVAL = float(os.getenv("COUNTERS_RECONCILE_INTERVAL", 300))  # Segundos
+
+COUNTERS_KEY = "counters:collections"
+_RECONCILED_AT_FIELD = "_reconciled_at"
+
+# Contador -> (coleção, filtro)
+COUNTERS: Dict[str, tuple] = {
+    "users": ("users", {}),
+    "modules": ("modules", {}),
+    "logs": ("logs", {}),
+    "pending_optimizations": ("ai_optimizations", {"status": "pending"}),
+}
+
+# Só incrementa contadores já inicializados pela reconciliação: um HINCRBY em campo
+# ausente criaria um valor parcial que pareceria exato
+_INCREMENT_IF_WARM = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    return redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+end
+return nil
+"""
+
+
+class CollectionCounters:
+    """
+    Contagens de documentos mantidas em um hash Redis, atualizadas pelos caminhos de escrita
+    dos serviços e corrigidas periodicamente contra o MongoDB. Leituras custam um HMGET.
+    """
+
+    def __init__(self, counters: Dict[str, tuple] = COUNTERS, reconcile_interval: float = COUNTERS_RECONCILE_INTERVAL):
+        self.counters = counters
+        self.reconcile_interval = reconcile_interval
+        self._script = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def increment(self, name: str, amount: int = 1):
+        """
+        Ajusta um contador (use `amount` negativo em remoções). Falhas são apenas registradas.
+        """
+        if not amount:
+            return
+        try:
+            redis_cache = await get_redis_cache()
+            if self._script is None:
+                self._script = redis_cache.redis.register_script(_INCREMENT_IF_WARM)
+            await self._script(keys=[COUNTERS_KEY], args=[name, amount])
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao atualizar contador '{name}': {str(e)}")
+
+    async def reset(self, name: str, value: int = 0):
+        """
+        Define o valor de um contador (ex.: após remover todos os documentos da coleção).
+        """
+        try:
+            redis_cache = await get_redis_cache()
+            await redis_cache.redis.hset(COUNTERS_KEY, name, value)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao redefinir contador '{name}': {str(e)}")
+
+    async def get_counts(self, names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Retorna os contadores pedidos. Contadores ainda não inicializados são estimados
+        pelo MongoDB (`estimated_document_count` sem filtro) e listados em `estimated`.
+        """
+        names = list(names)
+        values = [None] * len(names)
+        try:
+            redis_cache = await get_redis_cache()
+            values = await redis_cache.redis.hmget(COUNTERS_KEY, names)
+        except Exception as e:
+            logger.warning(f"⚠️ Contadores indisponíveis: {str(e)}")
+
+        counts: Dict[str, Any] = {}
+        estimated = []
+        for name, value in zip(names, values):
+            if value is not None:
+                counts[name] = int(value)
+                continue
+            counts[name] = await self._estimate(name)
+            estimated.append(name)
+
+        counts["estimated"] = estimated
+        return counts
+
+    async def _estimate(self, name: str) -> int:
+        collection, query = self.counters[name]
+        db = await get_database()
+        if not query:
+            return await db[collection].estimated_document_count()
+        return await db[collection].count_documents(query)
+
+    async def reconcile(self) -> Dict[str, int]:
+        """
+        Recalcula todos os contadores no MongoDB e grava os valores exatos no Redis.
+        Incrementos feitos durante a contagem podem se perder; o próximo ciclo os corrige.
+        """
+        db = await get_database()
+        values = {}
+        for name, (collection, query) in self.counters.items():
+            values[name] = await db[collection].count_documents(query)
+
+        redis_cache = await get_redis_cache()
+        await redis_cache.redis.hset(COUNTERS_KEY, mapping={**values, _RECONCILED_AT_FIELD: int(time.time())})
+        return values
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ Erro ao reconciliar contadores: {str(e)}")
+            await asyncio.sleep(self.reconcile_interval)
+
+    async def start(self):
+        """
+        Inicia a reconciliação periódica (chamado no startup da aplicação).
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="counters:reconcile")
+
+    async def stop(self):
+        """
+        Encerra a reconciliação periódica (chamado no shutdown da aplicação).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instância global dos contadores
+collection_counters = CollectionCounters()
+
+async def increment_counter(name: str, amount: int = 1):
+    """
+    Função global para ajustar um contador de coleção.
+    """
+    await collection_counters.increment(name, amount)
+
+async def reset_counter(name: str, value: int = 0):
+    """
+    Função global para redefinir um contador de coleção.
+    """
+    await collection_counters.reset(name, value)
+
+async def get_counts(*names: str) -> Dict[str, Any]:
+    """
+    Função global para ler contadores de coleção.
+    """
+    return await collection_counters.get_counts(names)
+
+async def record_logs_written(documents):
+    """
+    Listener do `log_sink`: soma os logs de cada lote gravado com um único HINCRBY.
+    """
+    await collection_counters.increment("logs", len(documents))
@@ -0,0 +1,58 @@
+# app/services/export_service.py
+
+import os
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional
+from bson.json_util import dumps, RELAXED_JSON_OPTIONS
+from pymongo import ASCENDING
+
+# Coleções que podem ser exportadas em NDJSON
+EXPORTABLE_COLLECTIONS = ("logs", "chat_history", "ai_decisions", "api_logs")
+
+# Tamanho dos lotes lidos do cursor e enviados ao cliente
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+EXPORT_MAX_BATCH_SIZE = int(os.getenv("EXPORT_MAX_BATCH_SIZE", 10000))
+
+
+async def stream_ndjson(
+    db,
+    collection: str,
+    query: Optional[Dict[str, Any]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Lê a coleção diretamente do cursor e gera blocos NDJSON de `batch_size` documentos,
+    opcionalmente comprimidos em gzip. A memória usada é limitada a um lote por vez.
+    """
+    batch_size = max(1, min(batch_size, EXPORT_MAX_BATCH_SIZE))
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: cabeçalho gzip
+
+    cursor = db[collection].find(query or {}) \
+        .sort([("timestamp", ASCENDING), ("_id", ASCENDING)]) \
+        .batch_size(batch_size)
+
+    lines = []
+    try:
+        async for document in cursor:
+            lines.append(dumps(document, json_options=RELAXED_JSON_OPTIONS))
+            if len(lines) < batch_size:
+                continue
+
+            chunk = ("\n".join(lines) + "\n").encode()
+            lines.clear()
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+        if lines:
+            chunk = ("\n".join(lines) + "\n").encode()
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+        if compressor:
+            yield compressor.flush()
+    finally:
+        # Cliente desconectado ou exportação concluída: libera o cursor no servidor
+        await cursor.close()
@@ -0,0 +1,159 @@
+# app/services/hot_routes.py
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from app.core.cache import get_redis_cache
+from app.core.request_timing import UNMATCHED_ROUTE, add_request_observer
+
+# Configuração de logs
+logger = logging.getLogger("hot_routes")
+logger.setLevel(logging.INFO)
+
+# Configuração do ranking de rotas mais acessadas
+HOT_ROUTES_HALF_LIFE = float(os.getenv("HOT_ROUTES_HALF_LIFE", 600))  # Segundos até um acesso valer metade
+HOT_ROUTES_FLUSH_INTERVAL = float(os.getenv("HOT_ROUTES_FLUSH_INTERVAL", 5))  # Segundos
+HOT_ROUTES_MAX_TRACKED = int(os.getenv("HOT_ROUTES_MAX_TRACKED", 1000))  # Rotas mantidas no sorted set
+
+HOT_ROUTES_KEY = "hot_routes:scores"
+HOT_ROUTES_LANDMARK_KEY = "hot_routes:landmark"
+TRACKED_METHODS = ("GET", "HEAD")  # Só leituras são candidatas a cache
+_RENORMALIZE_HALF_LIVES = 64  # Renormaliza antes que exp(λ·(t - marco)) se aproxime do limite do float
+
+# Decaimento para frente: cada acesso soma exp(λ·(t - marco)) e nunca é reescrito; dividir o score
+# por exp(λ·(agora - marco)) dá a contagem com decaimento exponencial. Quando o marco fica antigo,
+# todos os scores são multiplicados pelo mesmo fator (ZUNIONSTORE com WEIGHTS) e o marco avança.
+_RECORD_HITS = """
+local now = tonumber(ARGV[1])
+local decay = tonumber(ARGV[2])
+local renormalize_after = tonumber(ARGV[3])
+local max_tracked = tonumber(ARGV[4])
+
+local landmark = tonumber(redis.call('GET', KEYS[2]))
+if not landmark then
+    landmark = now
+    redis.call('SET', KEYS[2], landmark)
+elseif now - landmark > renormalize_after then
+    redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', math.exp(-decay * (now - landmark)))
+    landmark = now
+    redis.call('SET', KEYS[2], landmark)
+end
+
+local weight = math.exp(decay * (now - landmark))
+for i = 5, #ARGV, 2 do
+    redis.call('ZINCRBY', KEYS[1], tonumber(ARGV[i + 1]) * weight, ARGV[i])
+end
+
+local size = redis.call('ZCARD', KEYS[1])
+if size > max_tracked then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, size - max_tracked - 1)
+end
+return landmark
+"""
+
+
+class HotRoutes:
+    """
+    Ranking de rotas por frequência recente em um sorted set do Redis, com scores de decaimento
+    exponencial. Os acessos são somados em memória e enviados em lote (um script com ZINCRBY por rota)
+    a cada `flush_interval`; o top-K é um ZREVRANGE, com custo independente do tráfego acumulado.
+    """
+
+    def __init__(self, half_life: float = HOT_ROUTES_HALF_LIFE, flush_interval: float = HOT_ROUTES_FLUSH_INTERVAL, max_tracked: int = HOT_ROUTES_MAX_TRACKED):
+        self.decay = math.log(2) / half_life
+        self.flush_interval = flush_interval
+        self.max_tracked = max_tracked
+        self._pending: Counter = Counter()
+        self._script = None
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, record: Dict[str, Any]):
+        """
+        Observador do RequestTimingMiddleware: conta leituras bem-sucedidas por rota.
+        """
+        if record["method"] in TRACKED_METHODS and record["status_code"] < 400 and record["route"] != UNMATCHED_ROUTE:
+            self._pending[record["route"]] += 1
+
+    async def flush(self):
+        """
+        Envia as contagens acumuladas desde o último ciclo.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+
+        try:
+            redis_cache = await get_redis_cache()
+            if self._script is None:
+                self._script = redis_cache.redis.register_script(_RECORD_HITS)
+
+            args: List[Any] = [time.time(), self.decay, _RENORMALIZE_HALF_LIVES * math.log(2) / self.decay, self.max_tracked]
+            for route, hits in pending.items():
+                args.extend((route, hits))
+            await self._script(keys=[HOT_ROUTES_KEY, HOT_ROUTES_LANDMARK_KEY], args=args)
+        except Exception:
+            # O script é atômico: nada foi somado, as contagens voltam para o próximo ciclo
+            self._pending.update(pending)
+            raise
+
+    async def top(self, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        As `k` rotas mais acessadas recentemente, com a taxa estimada em requisições por minuto.
+        """
+        redis_cache = await get_redis_cache()
+        async with redis_cache.redis.pipeline(transaction=False) as pipe:
+            pipe.get(HOT_ROUTES_LANDMARK_KEY)
+            pipe.zrevrange(HOT_ROUTES_KEY, 0, k - 1, withscores=True)
+            landmark, ranked = await pipe.execute()
+
+        if landmark is None:
+            return []
+        # Com taxa constante r, a contagem decaída converge para r / λ
+        scale = math.exp(-self.decay * (time.time() - float(landmark))) * self.decay * 60
+        return [{"route": route, "requests_per_minute": round(score * scale, 2)} for route, score in ranked]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao atualizar o ranking de rotas: {str(e)}")
+
+    async def start(self):
+        """
+        Inicia o envio periódico (chamado no startup da aplicação).
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="hot-routes:flush")
+
+    async def stop(self):
+        """
+        Encerra o envio periódico e envia o que estiver pendente (chamado no shutdown).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao atualizar o ranking de rotas: {str(e)}")
+
+
+# Instância global do ranking, alimentada por todas as requisições medidas
+hot_routes = HotRoutes()
+add_request_observer(hot_routes.observe)
+
+async def get_hot_routes(k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Função global para ler as rotas mais acessadas recentemente.
+    """
+    return await hot_routes.top(k)
@@ -0,0 +1,191 @@
+# app/services/intent_resolver.py
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from app.core.cache import get_redis_cache
+from app.core.singleflight import SingleFlight
+from app.integrations.external_apis import complete_chat
+from app.services.intent_router import INTENTS, IntentRouter, intent_router, normalize_text
+
+# Configuração de logs
+logger = logging.getLogger("intent_resolver")
+logger.setLevel(logging.INFO)
+
+# Configuração da resolução de intenções
+INTENT_CACHE_TTL = int(os.getenv("INTENT_CACHE_TTL", 86400))  # Segundos
+INTENT_NEGATIVE_CACHE_TTL = int(os.getenv("INTENT_NEGATIVE_CACHE_TTL", 3600))  # Mensagens sem intenção
+INTENT_LLM_ENABLED = os.getenv("INTENT_LLM_ENABLED", "true").lower() == "true"
+INTENT_LLM_MODEL = os.getenv("INTENT_LLM_MODEL", "gpt-4o")
+
+_KEY_PREFIX = "intent:"
+_NO_INTENT = "none"
+_SLOT_STRIP_CHARS = ".,!?;:\"'()[]{}"
+
+# Classificador: recebe a mensagem e o catálogo e retorna {"intent": ..., "slots": {...}} ou None
+Classifier = Callable[[str, List[Dict[str, Any]]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class ResolvedIntent(NamedTuple):
+    intent: str
+    slots: Dict[str, Optional[str]]
+    source: str  # "rules", "cache" ou "llm"
+
+
+def utterance_cache_key(message: str) -> str:
+    """
+    Chave do cache a partir do hash da mensagem normalizada (sem acentos, minúscula, espaços colapsados).
+    """
+    return _KEY_PREFIX + hashlib.sha256(normalize_text(message).encode("utf-8")).hexdigest()
+
+
+async def llm_classifier(message: str, intents: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Classifica a mensagem com o modelo, restringindo a resposta às intenções do catálogo.
+    """
+    catalogue = "\n".join(
+        f"- {intent['intent']}: {intent.get('description', '')} Slots: {', '.join(intent.get('slots', [])) or 'nenhum'}"
+        for intent in intents
+    )
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "Classifique o pedido do Admin em uma das intenções abaixo.\n"
+                f"{catalogue}\n"
+                f"Responda apenas com JSON no formato {{\"intent\": \"<intenção ou {_NO_INTENT}>\", \"slots\": {{}}}}."
+            ),
+        },
+        {"role": "user", "content": message},
+    ]
+
+    data = await complete_chat(
+        messages,
+        model=INTENT_LLM_MODEL,
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
+    content = data.get("choices", [{}])[0].get("message", {}).get("content")
+    return json.loads(content) if content else None
+
+
+class IntentResolver:
+    """
+    Resolve a intenção de uma mensagem em três estágios, do mais barato ao mais caro:
+    regras locais compiladas, cache de mensagens já resolvidas e, só em caso de falha,
+    o classificador (LLM). Classificações do modelo são gravadas de volta no cache.
+    """
+
+    def __init__(
+        self,
+        router: IntentRouter = intent_router,
+        classifier: Optional[Classifier] = llm_classifier,
+        intents: List[Dict[str, Any]] = INTENTS,
+        cache_ttl: int = INTENT_CACHE_TTL,
+        negative_cache_ttl: int = INTENT_NEGATIVE_CACHE_TTL,
+    ):
+        self.router = router
+        self.classifier = classifier
+        self.intents = intents
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        self._slots = {intent["intent"]: intent.get("slots", []) for intent in intents}
+        self._inflight = SingleFlight()
+        self._metrics = {"rules": 0, "cache": 0, "llm": 0, "unresolved": 0, "classifier_errors": 0}
+
+    async def resolve(self, message: str) -> Optional[ResolvedIntent]:
+        """
+        Retorna a intenção da mensagem, ou None quando nenhum estágio a reconhece.
+        """
+        match = self.router.match(message)
+        if match is not None:
+            self._metrics["rules"] += 1
+            return ResolvedIntent(match.intent, match.slots, "rules")
+
+        key = utterance_cache_key(message)
+        cached = await self._get_cached(key)
+        if cached is not None:
+            resolved = self._build(cached, "cache")
+            self._metrics["cache" if resolved else "unresolved"] += 1
+            return resolved
+
+        if self.classifier is None:
+            self._metrics["unresolved"] += 1
+            return None
+
+        # Mensagens iguais simultâneas geram uma única classificação
+        resolution = await self._inflight.do(key, lambda: self._classify(key, message))
+        if resolution is None:
+            self._metrics["unresolved"] += 1
+            return None
+        self._metrics["llm"] += 1
+        return self._build(resolution, "llm")
+
+    async def _classify(self, key: str, message: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self.classifier(message, self.intents)
+        except Exception as e:
+            self._metrics["classifier_errors"] += 1
+            logger.warning(f"⚠️ Falha no classificador de intenções: {getattr(e, 'detail', str(e))}")
+            return None
+
+        resolution = self._validate(raw)
+        await self._store(key, resolution)
+        return resolution if resolution["intent"] != _NO_INTENT else None
+
+    def _validate(self, raw: Any) -> Dict[str, Any]:
+        """
+        Descarta intenções fora do catálogo e slots não declarados na resposta do classificador.
+        """
+        if not isinstance(raw, dict) or raw.get("intent") not in self._slots:
+            return {"intent": _NO_INTENT, "slots": {}}
+
+        intent = raw["intent"]
+        raw_slots = raw.get("slots") if isinstance(raw.get("slots"), dict) else {}
+        slots = {}
+        for slot in self._slots[intent]:
+            value = raw_slots.get(slot)
+            words = str(value).split() if value else []
+            value = words[0].strip(_SLOT_STRIP_CHARS) if words else ""
+            slots[slot] = value.capitalize() if value else None
+        return {"intent": intent, "slots": slots}
+
+    def _build(self, resolution: Dict[str, Any], source: str) -> Optional[ResolvedIntent]:
+        if resolution.get("intent") not in self._slots:
+            return None
+        return ResolvedIntent(resolution["intent"], resolution.get("slots", {}), source)
+
+    async def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            redis_cache = await get_redis_cache()
+            cached = await redis_cache.get_cache(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de intenções indisponível: {str(e)}")
+            return None
+
+    async def _store(self, key: str, resolution: Dict[str, Any]):
+        ttl = self.negative_cache_ttl if resolution["intent"] == _NO_INTENT else self.cache_ttl
+        try:
+            redis_cache = await get_redis_cache()
+            await redis_cache.set_cache(key, json.dumps(resolution), ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar intenção no cache: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna quantas mensagens foram resolvidas por estágio.
+        """
+        return dict(self._metrics)
+
+
+# Instância global do resolvedor de intenções
+intent_resolver = IntentResolver(classifier=llm_classifier if INTENT_LLM_ENABLED else None)
+
+async def resolve_intent(message: str) -> Optional[ResolvedIntent]:
+    """
+    Função global para resolver a intenção de uma mensagem.
+    """
+    return await intent_resolver.resolve(message)
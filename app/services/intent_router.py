@@ -0,0 +1,226 @@
+# app/services/intent_router.py
+
+import unicodedata
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Catálogo declarativo de intenções do Chat Assistente. A ordem define a prioridade
+# quando mais de uma intenção aparece na mesma mensagem. Frases são comparadas sem
+# acentos e sem diferenciar maiúsculas/minúsculas.
+INTENTS: List[Dict[str, Any]] = [
+    {
+        "intent": "create_module",
+        "description": "Criar um novo módulo no sistema.",
+        "phrases": [
+            "criar módulo", "criar o módulo", "criar um módulo", "criar um novo módulo",
+            "crie o módulo", "crie um módulo", "cria o módulo", "cria um módulo",
+            "novo módulo", "adicionar módulo", "adicionar um módulo",
+            "create module", "new module",
+        ],
+        "slots": ["module_name"],
+    },
+    {
+        "intent": "optimize_system",
+        "description": "Aplicar otimizações/fine-tuning para melhorar o desempenho do sistema.",
+        "phrases": [
+            "otimizar sistema", "otimizar o sistema", "otimize o sistema", "otimizar a plataforma",
+            "melhorar desempenho", "melhorar o desempenho", "melhorar a performance",
+            "optimize system",
+        ],
+        "slots": [],
+    },
+]
+
+# Palavras ignoradas entre a frase da intenção e o valor do slot ("novo módulo chamado X")
+SLOT_FILLER_WORDS = {"chamado", "chamada", "nomeado", "nomeada", "com", "nome", "de", "do", "o", "a", "named", "called"}
+
+_SLOT_STRIP_CHARS = ".,!?;:\"'()[]{}"
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    slots: Dict[str, Optional[str]]
+    start: int  # Posição da frase reconhecida na mensagem original
+    end: int
+
+
+class _FoldTable(dict):
+    """
+    Tabela para `str.translate` que remove acentos e converte para minúsculas caractere a caractere,
+    calculada sob demanda. Cada caractere vira exatamente um caractere, preservando as posições.
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        if char.isspace():
+            folded = " "
+        else:
+            base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c)).lower()
+            folded = base if len(base) == 1 else char.lower() if len(char.lower()) == 1 else char
+        self[code] = folded
+        return folded
+
+
+_fold_table = _FoldTable()
+
+
+def fold_text(text: str) -> Tuple[str, Sequence[int]]:
+    """
+    Remove acentos, converte para minúsculas e colapsa espaços.
+    Retorna o texto normalizado e, para cada caractere dele, a posição no texto original.
+    """
+    folded = text.translate(_fold_table)
+    if "  " not in folded and not folded.startswith(" ") and not folded.endswith(" "):
+        return folded, range(len(folded))
+
+    # Espaços repetidos: colapsa mantendo o mapeamento de posições
+    chars, positions = [], []
+    previous_space = True
+    for position, char in enumerate(folded):
+        if char == " ":
+            if previous_space:
+                continue
+            previous_space = True
+        else:
+            previous_space = False
+        chars.append(char)
+        positions.append(position)
+
+    if chars and chars[-1] == " ":
+        chars.pop()
+        positions.pop()
+    return "".join(chars), positions
+
+
+def normalize_text(text: str) -> str:
+    """
+    Forma normalizada (sem acentos, minúscula, espaços colapsados) usada para comparar mensagens.
+    """
+    return fold_text(text)[0]
+
+
+class IntentRouter:
+    """
+    Compila o catálogo de intenções em um único autômato Aho-Corasick.
+    A busca percorre a mensagem uma única vez, em tempo proporcional ao seu tamanho,
+    independentemente de quantas frases o catálogo tenha.
+    """
+
+    def __init__(self, intents: List[Dict[str, Any]] = INTENTS):
+        self.intents = intents
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, int]]] = [[]]  # (prioridade da intenção, tamanho da frase)
+        self._compile()
+
+    def _compile(self):
+        for priority, intent in enumerate(self.intents):
+            for phrase in intent["phrases"]:
+                folded = normalize_text(phrase)
+                node = 0
+                for char in folded:
+                    next_node = self._goto[node].get(char)
+                    if next_node is None:
+                        next_node = len(self._goto)
+                        self._goto[node][char] = next_node
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    node = next_node
+                self._output[node].append((priority, len(folded)))
+
+        # Links de falha em largura: cada nó herda as saídas do seu sufixo mais longo
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _scan(self, folded: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Retorna `(prioridade, início, fim)` da melhor frase encontrada em limites de palavra.
+        """
+        best = None
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        length = len(folded)
+
+        for index, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+
+            end = index + 1
+            if end < length and folded[end].isalnum():
+                continue
+            for priority, size in output[node]:
+                start = end - size
+                if start > 0 and folded[start - 1].isalnum():
+                    continue
+                candidate = (priority, start, -size)
+                if best is None or candidate < best:
+                    best = candidate
+
+        if best is None:
+            return None
+        priority, start, negative_size = best
+        return priority, start, start - negative_size
+
+    @staticmethod
+    def _extract_slot(message: str, folded: str, positions: Sequence[int], end: int) -> Optional[str]:
+        """
+        Extrai a primeira palavra significativa após a frase reconhecida, preservando a grafia original.
+        """
+        for word_start, word in _iter_words(folded, end):
+            if word.strip(_SLOT_STRIP_CHARS) in SLOT_FILLER_WORDS:
+                continue
+            original_start = positions[word_start]
+            original_end = positions[word_start + len(word) - 1] + 1
+            value = message[original_start:original_end].strip(_SLOT_STRIP_CHARS)
+            if value:
+                return value.capitalize()
+        return None
+
+    def match(self, message: str) -> Optional[IntentMatch]:
+        """
+        Identifica a intenção da mensagem e extrai seus slots.
+        """
+        folded, positions = fold_text(message)
+        found = self._scan(folded)
+        if found is None:
+            return None
+
+        priority, start, end = found
+        intent = self.intents[priority]
+        slots = {slot: self._extract_slot(message, folded, positions, end) for slot in intent.get("slots", [])}
+        return IntentMatch(intent["intent"], slots, positions[start], positions[end - 1] + 1)
+
+
+def _iter_words(folded: str, offset: int):
+    index = offset
+    length = len(folded)
+    while index < length:
+        if folded[index] == " ":
+            index += 1
+            continue
+        end = folded.find(" ", index)
+        end = length if end == -1 else end
+        yield index, folded[index:end]
+        index = end
+
+
+# Instância global do roteador, compilada uma única vez
+intent_router = IntentRouter()
+
+def match_intent(message: str) -> Optional[IntentMatch]:
+    """
+    Função global para identificar a intenção de uma mensagem.
+    """
+    return intent_router.match(message)
@@ -0,0 +1,194 @@
+# app/services/latency_sketches.py
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.database import get_database
+from app.core.quantiles import DDSketch
+from app.core.request_timing import add_request_observer
+
+# Configuração de logs
+logger = logging.getLogger("latency_sketches")
+logger.setLevel(logging.INFO)
+
+# Configuração dos sketches de latência por rota
+LATENCY_SKETCH_ACCURACY = float(os.getenv("LATENCY_SKETCH_ACCURACY", 0.01))  # Erro relativo dos percentis
+LATENCY_SKETCH_FLUSH_INTERVAL = float(os.getenv("LATENCY_SKETCH_FLUSH_INTERVAL", 10))  # Segundos
+LATENCY_SKETCH_RETENTION_HOURS = int(os.getenv("LATENCY_SKETCH_RETENTION_HOURS", 48))
+LATENCY_REPORT_WINDOWS = [int(w) for w in os.getenv("LATENCY_REPORT_WINDOWS", "5,60,1440").split(",")]  # Minutos
+
+SKETCHES_COLLECTION = "latency_sketches"
+REPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def window_start(timestamp: datetime) -> datetime:
+    """
+    Início da janela de um minuto que contém o instante.
+    """
+    return timestamp.replace(second=0, microsecond=0)
+
+
+class LatencySketches:
+    """
+    Mantém um DDSketch por (rota, minuto) em memória, alimentado por todas as requisições
+    (antes da amostragem de `api_logs`), e grava periodicamente os buckets em `latency_sketches`
+    com `$inc`. Vários workers somam no mesmo documento, então o resultado no MongoDB já é o
+    sketch combinado; janelas maiores são a soma dos minutos.
+    """
+
+    def __init__(self, relative_accuracy: float = LATENCY_SKETCH_ACCURACY, flush_interval: float = LATENCY_SKETCH_FLUSH_INTERVAL):
+        self.relative_accuracy = relative_accuracy
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, datetime], DDSketch] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, record: Dict[str, Any]):
+        """
+        Observador do RequestTimingMiddleware: adiciona a latência (ms) ao sketch do minuto atual.
+        """
+        key = (record["route"], window_start(datetime.utcnow()))
+        sketch = self._pending.get(key)
+        if sketch is None:
+            sketch = self._pending[key] = DDSketch(self.relative_accuracy)
+        sketch.add(record["response_time"])
+
+    def build_updates(self, pending: Dict[Tuple[str, datetime], DDSketch]) -> List[UpdateOne]:
+        """
+        Converte os sketches acumulados em upserts com `$inc` nos buckets de cada (rota, minuto).
+        """
+        updates = []
+        for (route, window), sketch in pending.items():
+            increments: Dict[str, Any] = {f"bins.{key}": weight for key, weight in sketch.to_bins().items()}
+            increments["count"] = sketch.count
+            increments["zero_count"] = sketch.zero_count
+            increments["sum"] = sketch.sum
+            updates.append(UpdateOne(
+                {"route": route, "window": window},
+                {
+                    "$inc": increments,
+                    "$setOnInsert": {
+                        "relative_accuracy": self.relative_accuracy,
+                        "expire_at": window + timedelta(hours=LATENCY_SKETCH_RETENTION_HOURS),
+                    },
+                },
+                upsert=True,
+            ))
+        return updates
+
+    async def flush(self):
+        """
+        Grava os sketches acumulados desde o último ciclo.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            db = await get_database()
+            await db[SKETCHES_COLLECTION].bulk_write(self.build_updates(pending), ordered=False)
+        except BulkWriteError as e:
+            # Os upserts aplicados já somaram seus buckets; só os que falharam voltam para a fila
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self._requeue({key: sketch for index, (key, sketch) in enumerate(pending.items()) if index in failed})
+            raise
+        except Exception:
+            self._requeue(pending)
+            raise
+
+    def _requeue(self, pending: Dict[Tuple[str, datetime], DDSketch]):
+        """
+        Devolve sketches não gravados ao acumulado atual, para a próxima tentativa.
+        """
+        for key, sketch in pending.items():
+            current = self._pending.get(key)
+            if current is None:
+                self._pending[key] = sketch
+            else:
+                current.merge(sketch)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Erro ao gravar sketches de latência: {str(e)}")
+
+    async def start(self):
+        """
+        Inicia a gravação periódica (chamado no startup da aplicação).
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="latency-sketches:flush")
+
+    async def stop(self):
+        """
+        Encerra a gravação periódica e grava o que estiver pendente (chamado no shutdown).
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar sketches de latência: {str(e)}")
+
+
+async def get_route_percentiles(db, window_minutes: int, quantiles=REPORT_QUANTILES) -> List[Dict[str, Any]]:
+    """
+    Percentis de latência (ms) por rota nos últimos `window_minutes`, combinando os sketches
+    por minuto. A memória é de um sketch por rota, independente do volume de requisições.
+    """
+    since = window_start(datetime.utcnow()) - timedelta(minutes=window_minutes - 1)
+    cursor = db[SKETCHES_COLLECTION].find(
+        {"window": {"$gte": since}},
+        {"_id": 0, "route": 1, "bins": 1, "count": 1, "zero_count": 1, "sum": 1, "relative_accuracy": 1},
+    )
+
+    merged: Dict[str, DDSketch] = {}
+    async for document in cursor:
+        sketch = merged.get(document["route"])
+        if sketch is None:
+            sketch = merged[document["route"]] = DDSketch(document.get("relative_accuracy", LATENCY_SKETCH_ACCURACY))
+        sketch.merge_bins(document.get("bins", {}), document.get("zero_count", 0), document.get("count"), document.get("sum", 0.0))
+
+    report = []
+    for route, sketch in merged.items():
+        entry: Dict[str, Any] = {"route": route, "count": sketch.count, "mean_ms": round(sketch.sum / sketch.count, 3) if sketch.count else None}
+        for q, value in sketch.quantiles(quantiles).items():
+            entry[f"p{round(q * 100):g}_ms"] = round(value, 3) if value is not None else None
+        report.append(entry)
+
+    report.sort(key=lambda entry: entry.get("p99_ms") or 0, reverse=True)
+    return report
+
+
+async def get_latency_report(db, windows: List[int] = LATENCY_REPORT_WINDOWS) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Percentis por rota para cada janela deslizante configurada (ex.: `5m`, `60m`, `1440m`).
+    """
+    return {f"{minutes}m": await get_route_percentiles(db, minutes) for minutes in windows}
+
+
+# Instância global dos sketches, alimentada por todas as requisições medidas
+latency_sketches = LatencySketches()
+add_request_observer(latency_sketches.observe)
+
+async def start_latency_sketches():
+    """
+    Inicia a gravação periódica dos sketches de latência.
+    """
+    await latency_sketches.start()
+
+async def stop_latency_sketches():
+    """
+    Grava os sketches pendentes e encerra a tarefa periódica.
+    """
+    await latency_sketches.stop()
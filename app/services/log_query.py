@@ -0,0 +1,35 @@
+# app/services/log_query.py
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+@lru_cache(maxsize=1024)
+def parse_date(value: str) -> datetime:
+    """
+    Converte uma data no formato YYYY-MM-DD (ou ISO 8601 com horário) para datetime.
+    Os filtros se repetem muito entre requisições, então o resultado é memorizado.
+    """
+    return datetime.fromisoformat(value)
+
+
+def build_log_query(
+    log_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Monta o filtro do MongoDB usado na listagem e na exportação de logs.
+    Lança ValueError se alguma data estiver em formato inválido.
+    """
+    query: Dict[str, Any] = {}
+
+    if log_type:
+        query["log_type"] = log_type
+    if start_date:
+        query["timestamp"] = {"$gte": parse_date(start_date)}
+    if end_date:
+        query.setdefault("timestamp", {})["$lte"] = parse_date(end_date)
+
+    return query
@@ -0,0 +1,124 @@
+# app/services/log_rollups.py
+
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from pymongo import UpdateOne
+from app.core.database import get_database
+
+# Configuração de logs
+logger = logging.getLogger("log_rollups")
+logger.setLevel(logging.INFO)
+
+# Retenção dos buckets por minuto (os buckets por hora não expiram)
+LOG_ROLLUP_MINUTE_RETENTION_DAYS = int(os.getenv("LOG_ROLLUP_MINUTE_RETENTION_DAYS", 7))
+LOG_ROLLUP_MAX_BUCKETS = 2000  # Pontos por consulta da série temporal
+
+GRANULARITIES = ("minute", "hour")
+ROLLUPS_COLLECTION = "log_rollups"
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """
+    Início do bucket (minuto ou hora) que contém o instante.
+    """
+    if granularity == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _field(value: Any) -> str:
+    # Nomes de campo do MongoDB não podem conter "." nem começar com "$"
+    return str(value).replace(".", "_").lstrip("$") or "desconhecido"
+
+
+def _level(document: Dict[str, Any]) -> str:
+    return _field(document.get("level") or document.get("nivel") or "INFO").upper()
+
+
+def _origin(document: Dict[str, Any]) -> str:
+    return _field(document.get("origem") or "system")
+
+
+def build_rollup_updates(documents: List[Dict[str, Any]]) -> List[UpdateOne]:
+    """
+    Agrega os logs de um lote em incrementos por bucket: um upsert por (granularidade, bucket),
+    com totais por nível e por origem/nível.
+    """
+    increments: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    for document in documents:
+        timestamp = document.get("timestamp")
+        if not isinstance(timestamp, datetime):
+            continue
+        level, origin = _level(document), _origin(document)
+        for granularity in GRANULARITIES:
+            counts = increments[(granularity, bucket_start(timestamp, granularity))]
+            counts["total"] += 1
+            counts[f"levels.{level}"] += 1
+            counts[f"origins.{origin}.{level}"] += 1
+
+    updates = []
+    for (granularity, bucket), counts in increments.items():
+        update: Dict[str, Any] = {"$inc": dict(counts)}
+        if granularity == "minute":
+            update["$setOnInsert"] = {"expire_at": bucket + timedelta(days=LOG_ROLLUP_MINUTE_RETENTION_DAYS)}
+        updates.append(UpdateOne({"granularity": granularity, "bucket": bucket}, update, upsert=True))
+    return updates
+
+
+async def record_log_rollups(documents: List[Dict[str, Any]]):
+    """
+    Atualiza os buckets de `log_rollups` com os logs gravados em um lote do `log_sink`.
+    """
+    updates = build_rollup_updates(documents)
+    if not updates:
+        return
+
+    db = await get_database()
+    await db[ROLLUPS_COLLECTION].bulk_write(updates, ordered=False)
+
+
+async def get_log_series(
+    db,
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    level: Optional[str] = None,
+    origin: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Série temporal de contagens de logs lida dos buckets pré-agregados.
+    Com `level` e/ou `origin`, `count` traz só a fatia filtrada; sem filtros, o total do bucket.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidade inválida: {granularity}")
+
+    query: Dict[str, Any] = {"granularity": granularity}
+    period: Dict[str, Any] = {}
+    if start:
+        period["$gte"] = bucket_start(start, granularity)
+    if end:
+        period["$lte"] = end
+    if period:
+        query["bucket"] = period
+
+    buckets = await db[ROLLUPS_COLLECTION].find(query, {"_id": 0, "expire_at": 0, "granularity": 0}) \
+        .sort("bucket", 1) \
+        .limit(LOG_ROLLUP_MAX_BUCKETS) \
+        .to_list(length=LOG_ROLLUP_MAX_BUCKETS)
+
+    level = level.upper() if level else None
+    series = []
+    for bucket in buckets:
+        if origin:
+            origin_counts = bucket.get("origins", {}).get(_field(origin), {})
+            count = origin_counts.get(level, 0) if level else sum(origin_counts.values())
+        elif level:
+            count = bucket.get("levels", {}).get(level, 0)
+        else:
+            count = bucket.get("total", 0)
+        series.append({"bucket": bucket["bucket"], "count": count, "levels": bucket.get("levels", {})})
+    return series
@@ -0,0 +1,76 @@
+# app/services/log_search.py
+
+import os
+from typing import Any, Dict, List
+from pymongo import DESCENDING
+from app.core.pagination import clamp_page_size, decode_cursor, encode_cursor, paginate
+from app.models.logs_model import LogSearchParams
+
+# Profundidade máxima da paginação por relevância (páginas além disso raramente são úteis)
+LOG_SEARCH_MAX_OFFSET = int(os.getenv("LOG_SEARCH_MAX_OFFSET", 1000))
+
+_RELEVANCE_CURSOR = "relevance"
+
+
+def _case_variants(value: str) -> List[str]:
+    # `log_event` grava níveis em maiúsculas ("ERROR"); LogEntry usa minúsculas ("error")
+    return list(dict.fromkeys([value, value.upper(), value.lower()]))
+
+
+def build_search_query(params: LogSearchParams) -> Dict[str, Any]:
+    """
+    Monta o filtro do MongoDB a partir dos parâmetros da busca.
+    Texto livre usa o índice de texto `logs_text`; os demais filtros usam os índices compostos da coleção.
+    """
+    conditions: List[Dict[str, Any]] = []
+
+    if params.q and params.q.strip():
+        conditions.append({"$text": {"$search": params.q.strip()}})
+    if params.nivel:
+        levels = _case_variants(params.nivel)
+        conditions.append({"$or": [{"level": {"$in": levels}}, {"nivel": {"$in": levels}}]})
+    if params.origem:
+        conditions.append({"origem": params.origem})
+    if params.usuario_id:
+        conditions.append({"usuario_id": params.usuario_id})
+
+    period: Dict[str, Any] = {}
+    if params.data_inicio:
+        period["$gte"] = params.data_inicio
+    if params.data_fim:
+        period["$lte"] = params.data_fim
+    if period:
+        conditions.append({"timestamp": period})
+
+    if not conditions:
+        return {}
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+async def search_logs(db, params: LogSearchParams) -> Dict[str, Any]:
+    """
+    Busca logs por texto e filtros. Com texto, os resultados vêm ordenados por relevância
+    (score do índice de texto) e paginados por deslocamento até `LOG_SEARCH_MAX_OFFSET`;
+    sem texto, do mais recente ao mais antigo, paginados por keyset.
+    """
+    query = build_search_query(params)
+
+    if not (params.q and params.q.strip()):
+        page = await paginate(db["logs"], query, limit=params.limit, cursor=params.cursor)
+        return {"logs": page["items"], "next_cursor": page["next_cursor"]}
+
+    page_size = clamp_page_size(params.limit)
+    offset = decode_cursor(params.cursor, _RELEVANCE_CURSOR)[0] if params.cursor else 0
+    offset = max(0, min(int(offset), LOG_SEARCH_MAX_OFFSET))
+
+    projection = {"score": {"$meta": "textScore"}}
+    items = await db["logs"].find(query, projection) \
+        .sort([("score", {"$meta": "textScore"}), ("timestamp", DESCENDING), ("_id", DESCENDING)]) \
+        .skip(offset) \
+        .limit(page_size + 1) \
+        .to_list(length=page_size + 1)
+
+    next_cursor = None
+    if len(items) > page_size and offset + page_size < LOG_SEARCH_MAX_OFFSET:
+        next_cursor = encode_cursor(_RELEVANCE_CURSOR, offset + page_size, None)
+    return {"logs": items[:page_size], "next_cursor": next_cursor}
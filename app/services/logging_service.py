@@ -1,41 +1,83 @@
 # app/services/logging_service.py
 
 import logging
+import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from app.core.database import get_database
+from app.core.batch_writer import BatchWriter
+from app.services.log_rollups import record_log_rollups
+from app.services.counters import record_logs_written
 
-# Configuração do logging para evitar conflitos de threads
-logging.basicConfig(
-    filename="storage/logs/system.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+# Configuração do buffer de gravação dos logs no MongoDB
+LOG_SINK_BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", 500))
+LOG_SINK_FLUSH_INTERVAL = float(os.getenv("LOG_SINK_FLUSH_INTERVAL", 1.0))  # Segundos
+LOG_SINK_MAX_BUFFER = int(os.getenv("LOG_SINK_MAX_BUFFER", 10000))
+LOG_SINK_BLOCK_TIMEOUT = float(os.getenv("LOG_SINK_BLOCK_TIMEOUT", 0))  # 0 = descarta quando cheio
+LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "storage/logs/system.log")
+
+# Configuração do logging em arquivo: a escrita em disco acontece na thread do QueueListener,
+# fora do event loop
+os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
+_file_handler = logging.FileHandler(LOG_FILE_PATH)
+_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_file_listener = QueueListener(_log_queue, _file_handler)
+_file_listener.start()
+
+system_logger = logging.getLogger("system")
+system_logger.setLevel(logging.INFO)
+system_logger.addHandler(QueueHandler(_log_queue))
+
+# Buffer de gravação em lote da coleção `logs`
+log_sink = BatchWriter(
+    "logs",
+    batch_size=LOG_SINK_BATCH_SIZE,
+    flush_interval=LOG_SINK_FLUSH_INTERVAL,
+    max_buffer=LOG_SINK_MAX_BUFFER,
+    block_timeout=LOG_SINK_BLOCK_TIMEOUT,
 )
 
+# Contagens por minuto/hora em `log_rollups` e o contador total de logs, atualizados a cada lote gravado
+log_sink.add_flush_listener(record_log_rollups)
+log_sink.add_flush_listener(record_logs_written)
+
+async def start_log_sink():
+    """
+    Inicia a gravação em lote dos logs (chamado no startup da aplicação).
+    """
+    await log_sink.start()
+
+async def stop_log_sink():
+    """
+    Grava os logs pendentes e encerra o buffer (chamado no shutdown da aplicação).
+    """
+    await log_sink.stop()
+    _file_listener.stop()
+
 async def log_event(event: str, level: str = "INFO"):
     """
     Registra eventos no banco de dados e no arquivo de logs do sistema.
+    A gravação no MongoDB é feita em lote, fora do caminho da requisição.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
     log_data = {
         "event": event,
         "level": level,
         "timestamp": datetime.utcnow()
     }
 
-    try:
-        await db["logs"].insert_one(log_data)  # 🔹 Garantindo gravação assíncrona correta
-        logging.log(getattr(logging, level, logging.INFO), event)
-        return {"response": f"Log registrado: {event} - Nível: {level}"}
-    except Exception as e:
-        return {"error": f"Falha ao registrar log: {str(e)}"}
+    system_logger.log(getattr(logging, level, logging.INFO), event)
+    if not await log_sink.submit(log_data):
+        return {"error": "Falha ao registrar log: buffer cheio, evento descartado."}
+    return {"response": f"Log registrado: {event} - Nível: {level}"}
 
 async def get_recent_logs(limit: int = 50):
     """
     Retorna os últimos logs do sistema.
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
+
     try:
         logs = await db["logs"].find().sort("timestamp", -1).limit(limit).to_list(None)
         return {"logs": logs}
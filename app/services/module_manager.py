@@ -3,6 +3,10 @@
 from datetime import datetime
 from app.core.database import get_database
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.services.module_repository import get_module_by_name, invalidate_module
+from app.services.counters import increment_counter
+from app.core.cache import CACHE_TAG_MODULES, invalidate_cache_tags
 
 async def create_module(module_name: str, module_type: str = "internal", description: str = "Módulo criado pelo Chat Central"):
     """
@@ -10,7 +14,7 @@ async def create_module(module_name: str, module_type: str = "internal", descrip
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    existing_module = await db["modules"].find_one({"name": module_name})
+    existing_module = await get_module_by_name(module_name)
     if existing_module:
         return {"error": f"O módulo '{module_name}' já existe."}
 
@@ -23,7 +27,14 @@ async def create_module(module_name: str, module_type: str = "internal", descrip
         "versions": []
     }
 
-    await db["modules"].insert_one(module_data)
+    try:
+        await db["modules"].insert_one(module_data)
+    except DuplicateKeyError:
+        return {"error": f"O módulo '{module_name}' já existe."}
+    finally:
+        await invalidate_module(module_name)  # Descarta o cache negativo do nome
+    await invalidate_cache_tags(CACHE_TAG_MODULES)  # Listas e catálogos de módulos
+    await increment_counter("modules")
     return {"message": f"Módulo '{module_name}' criado com sucesso!", "module": module_data}
 
 async def update_module(module_name: str, updates: dict):
@@ -32,12 +43,17 @@ async def update_module(module_name: str, updates: dict):
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    module = await db["modules"].find_one({"name": module_name})
+    module = await get_module_by_name(module_name)
     if not module:
         return {"error": f"Módulo '{module_name}' não encontrado."}
 
     updates["updated_at"] = datetime.utcnow()  # 🔹 Correção: Garantindo que `updated_at` seja sempre atualizado
     await db["modules"].update_one({"name": module_name}, {"$set": updates})
+    await invalidate_module(module_name)
+    new_name = updates.get("name")
+    if new_name and new_name != module_name:
+        await invalidate_module(new_name)  # Renomeado: descarta o cache negativo do novo nome
+    await invalidate_cache_tags(CACHE_TAG_MODULES)
     return {"message": f"Módulo '{module_name}' atualizado!", "updated_fields": updates}
 
 async def delete_module(module_name: str):
@@ -51,7 +67,10 @@ async def delete_module(module_name: str):
         return {"error": f"O módulo '{module_name}' possui dependências e não pode ser excluído."}
 
     result = await db["modules"].delete_one({"name": module_name})
+    await invalidate_module(module_name)
+    await invalidate_cache_tags(CACHE_TAG_MODULES)
     if result.deleted_count == 0:
         return {"error": f"Módulo '{module_name}' não encontrado."}
+    await increment_counter("modules", -1)
 
     return {"message": f"Módulo '{module_name}' removido com sucesso!"}
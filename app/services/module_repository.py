@@ -0,0 +1,131 @@
+# app/services/module_repository.py
+
+import copy
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from bson import json_util
+from app.core.database import get_database
+from app.core.cache import get_redis_cache
+
+# Configuração de logs
+logger = logging.getLogger("module_repository")
+logger.setLevel(logging.INFO)
+
+# Configuração do cache de módulos
+MODULE_CACHE_L1_SIZE = int(os.getenv("MODULE_CACHE_L1_SIZE", 1024))  # Entradas mantidas em memória
+MODULE_CACHE_L1_TTL = float(os.getenv("MODULE_CACHE_L1_TTL", 5))  # Segundos no cache em processo
+MODULE_CACHE_TTL = int(os.getenv("MODULE_CACHE_TTL", 60))  # Segundos no Redis
+MODULE_CACHE_NEGATIVE_TTL = int(os.getenv("MODULE_CACHE_NEGATIVE_TTL", 10))  # Segundos para módulos inexistentes
+
+_MISSING = "__missing__"
+
+
+class ModuleRepository:
+    """
+    Leitura de módulos por nome com cache em dois níveis: LRU em processo (L1) e Redis (L2).
+    Ausências também são cacheadas, com TTL menor. O L1 de outros workers pode ficar
+    desatualizado por no máximo `MODULE_CACHE_L1_TTL` segundos após uma escrita.
+    """
+
+    def __init__(self, max_size: int = MODULE_CACHE_L1_SIZE, local_ttl: float = MODULE_CACHE_L1_TTL):
+        self.max_size = max_size
+        self.local_ttl = local_ttl
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generation = 0
+
+    @staticmethod
+    def _key(module_name: str) -> str:
+        return f"module:name:{module_name}"
+
+    def _get_local(self, module_name: str):
+        entry = self._local.get(module_name)
+        if entry is None:
+            return False, None
+
+        expires_at, module = entry
+        if expires_at < time.monotonic():
+            self._local.pop(module_name, None)
+            return False, None
+
+        self._local.move_to_end(module_name)
+        return True, module
+
+    def _set_local(self, module_name: str, module: Optional[Dict[str, Any]]):
+        self._local[module_name] = (time.monotonic() + self.local_ttl, module)
+        self._local.move_to_end(module_name)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get_by_name(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o módulo com o nome informado, ou None se ele não existir.
+        """
+        found, module = self._get_local(module_name)
+        if found:
+            return copy.deepcopy(module)
+
+        generation = self._generation
+        key = self._key(module_name)
+
+        try:
+            redis_cache = await get_redis_cache()
+            cached = await redis_cache.get_cache(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de módulos indisponível: {str(e)}")
+            redis_cache, cached = None, None
+
+        if cached is not None:
+            module = None if cached == _MISSING else json_util.loads(cached)
+            self._set_local(module_name, module)
+            return copy.deepcopy(module)
+
+        db = await get_database()
+        module = await db["modules"].find_one({"name": module_name})
+
+        # Uma invalidação durante a consulta torna o resultado suspeito; não cachear
+        if generation != self._generation:
+            return module
+
+        self._set_local(module_name, copy.deepcopy(module))
+        if redis_cache is not None:
+            try:
+                if module is None:
+                    await redis_cache.set_cache(key, _MISSING, ttl=MODULE_CACHE_NEGATIVE_TTL)
+                else:
+                    await redis_cache.set_cache(key, json_util.dumps(module), ttl=MODULE_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao gravar módulo '{module_name}' no cache: {str(e)}")
+
+        return module
+
+    async def invalidate(self, module_name: str):
+        """
+        Remove o módulo dos dois níveis de cache após uma escrita.
+        """
+        self._generation += 1
+        self._local.pop(module_name, None)
+
+        try:
+            redis_cache = await get_redis_cache()
+            await redis_cache.clear_cache(self._key(module_name))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao invalidar módulo '{module_name}' no cache: {str(e)}")
+
+
+# Instância global do repositório
+module_repository = ModuleRepository()
+
+async def get_module_by_name(module_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Função global para buscar um módulo pelo nome através do cache.
+    """
+    return await module_repository.get_by_name(module_name)
+
+async def invalidate_module(module_name: str):
+    """
+    Função global para invalidar um módulo no cache.
+    """
+    await module_repository.invalidate(module_name)
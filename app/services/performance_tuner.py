@@ -1,11 +1,22 @@
 # app/services/performance_tuner.py
 
+import os
 from datetime import datetime
 from app.core.database import get_database
 from app.core.cache import get_redis_cache
+from app.services.latency_sketches import get_latency_report, get_route_percentiles
+from app.services.hot_routes import get_hot_routes
+from app.core.response_cache import cache_flag_key
 from fastapi import HTTPException
 from typing import Dict, Any
 
+# Rotas cujo p95 na janela passa do limite são reportadas como lentas
+SLOW_ENDPOINT_P95_MS = float(os.getenv("SLOW_ENDPOINT_P95_MS", 500))
+SLOW_ENDPOINT_WINDOW_MINUTES = int(os.getenv("SLOW_ENDPOINT_WINDOW_MINUTES", 60))
+# Rotas de leitura com taxa recente acima disso são sugeridas para cache
+CACHE_CANDIDATE_MIN_RPM = float(os.getenv("CACHE_CANDIDATE_MIN_RPM", 30))
+CACHE_CANDIDATE_TOP_K = int(os.getenv("CACHE_CANDIDATE_TOP_K", 5))
+
 async def analyze_performance() -> Dict[str, Any]:
     """
     Analisa logs do sistema para identificar endpoints com desempenho abaixo do esperado.
@@ -15,18 +26,19 @@ async def analyze_performance() -> Dict[str, Any]:
     performance_report = {
         "timestamp": datetime.utcnow(),
         "slow_endpoints": [],
-        "cache_optimizations": []
+        "cache_optimizations": [],
+        "latency_percentiles": await get_latency_report(db)  # p50/p95/p99 por rota em cada janela
     }
 
-    # Identificar endpoints lentos com base no tempo de resposta médio
+    # Identificar endpoints lentos pelo p95 dos sketches de latência
     slow_endpoints = await detect_slow_endpoints()
     if slow_endpoints:
-        performance_report["slow_endpoints"].extend(slow_endpoints)
+        performance_report["slow_endpoints"].append(slow_endpoints)
 
     # Verificar se algum endpoint pode ser otimizado via cache
     cache_optimizations = await detect_cache_opportunities()
     if cache_optimizations:
-        performance_report["cache_optimizations"].extend(cache_optimizations)
+        performance_report["cache_optimizations"].append(cache_optimizations)
 
     # Registrar relatório de otimização no banco de dados
     await db["performance_audit"].insert_one(performance_report)
@@ -35,39 +47,35 @@ async def analyze_performance() -> Dict[str, Any]:
 
 async def detect_slow_endpoints() -> Dict[str, Any]:
     """
-    Detecta endpoints com tempo de resposta superior ao limite recomendado.
+    Detecta endpoints cujo p95 na janela recente supera o limite recomendado,
+    a partir dos sketches de latência (e não de requisições isoladas).
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
-    threshold = 500  # Tempo limite em milissegundos
-    slow_requests = await db["api_logs"].find({"response_time": {"$gt": threshold}}).sort("response_time", -1).limit(10).to_list(length=10)
 
-    if slow_requests:
+    percentiles = await get_route_percentiles(db, SLOW_ENDPOINT_WINDOW_MINUTES)
+    slow_routes = [route for route in percentiles if (route["p95_ms"] or 0) > SLOW_ENDPOINT_P95_MS][:10]
+
+    if slow_routes:
         return {
             "category": "slow_endpoints",
-            "description": "Endpoints com tempo de resposta acima do limite recomendado.",
-            "affected_endpoints": [{"route": req["route"], "response_time": req["response_time"]} for req in slow_requests]
+            "description": f"Endpoints com p95 acima de {SLOW_ENDPOINT_P95_MS:g} ms nos últimos {SLOW_ENDPOINT_WINDOW_MINUTES} minutos.",
+            "affected_endpoints": slow_routes
         }
     return {}
 
 async def detect_cache_opportunities() -> Dict[str, Any]:
     """
-    Identifica endpoints que podem se beneficiar de cache dinâmico.
+    Identifica endpoints que podem se beneficiar de cache dinâmico, a partir do ranking
+    de rotas mais acessadas recentemente (custo constante, independente do histórico).
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
-    high_frequency_routes = await db["api_logs"].aggregate([
-        {"$group": {"_id": "$route", "count": {"$sum": 1}}},
-        {"$match": {"count": {"$gt": 50}}},  # Somente endpoints acessados frequentemente
-        {"$sort": {"count": -1}},
-        {"$limit": 5}
-    ]).to_list(length=5)
+    hot = await get_hot_routes(CACHE_CANDIDATE_TOP_K)
+    high_frequency_routes = [route for route in hot if route["requests_per_minute"] >= CACHE_CANDIDATE_MIN_RPM]
 
     if high_frequency_routes:
         return {
             "category": "cache_optimizations",
-            "description": "Endpoints frequentemente acessados podem ser otimizados com cache.",
-            "suggested_cache_routes": [{"route": route["_id"], "access_count": route["count"]} for route in high_frequency_routes]
+            "description": f"Endpoints de leitura com mais de {CACHE_CANDIDATE_MIN_RPM:g} requisições por minuto podem ser otimizados com cache.",
+            "suggested_cache_routes": high_frequency_routes
         }
     return {}
 
@@ -80,7 +88,8 @@ async def apply_cache_optimization(route: str, ttl: int = 300) -> Dict[str, Any]
     if not route:
         raise HTTPException(status_code=400, detail="A rota do endpoint não pode estar vazia.")
 
-    await redis_cache.setex(f"cache:{route}", ttl, "ENABLED")  # 🔹 Correção: Agora `await`
+    # Lida pelo ResponseCacheMiddleware: enquanto a flag existir, as respostas GET da rota vêm do Redis
+    await redis_cache.set_cache(cache_flag_key(route), "ENABLED", ttl)
     return {"message": f"Cache ativado para '{route}' por {ttl} segundos."}
 
 async def clear_cache(route: str) -> Dict[str, Any]:
@@ -89,7 +98,7 @@ async def clear_cache(route: str) -> Dict[str, Any]:
     """
     redis_cache = await get_redis_cache()  # 🔹 Correção: Adicionado `await get_redis_cache()`
     
-    await redis_cache.delete(f"cache:{route}")  # 🔹 Correção: Agora `await`
+    await redis_cache.clear_cache(cache_flag_key(route))
     return {"message": f"Cache removido para '{route}'."}
 
 async def log_performance_event(event: Dict[str, Any]):
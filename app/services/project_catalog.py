@@ -1,25 +1,30 @@
 # app/services/project_catalog.py
 
+import os
 from app.core.database import get_database
+from app.core.cache import CACHE_TAG_MODULES, cached
 from app.models.project_model import Project
 from fastapi import HTTPException
 
+# O catálogo é invalidado pela tag de módulos a cada escrita; o TTL cobre coleções criadas fora da API
+PROJECT_CATALOG_CACHE_TTL = int(os.getenv("PROJECT_CATALOG_CACHE_TTL", 300))
+
+async def _build_catalog():
+    db = await get_database()
+    modules = await db["modules"].find({}, {"name": 1}).to_list(None)
+    database_collections = await db.list_collection_names()
+    return {
+        "total_modules": len(modules),
+        "modules": [mod["name"] for mod in modules],
+        "database_collections": database_collections
+    }
+
 async def catalog_project():
     """
     Gera um relatório sobre os módulos existentes, APIs e banco de dados.
     """
-    db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
-    
     try:
-        modules = await db["modules"].find().to_list(None)
-        database_collections = await db.list_collection_names()
-
-        project_data = {
-            "total_modules": len(modules),
-            "modules": [mod["name"] for mod in modules],
-            "database_collections": database_collections
-        }
-
+        project_data = await cached("project_catalog", _build_catalog, PROJECT_CATALOG_CACHE_TTL, tags=[CACHE_TAG_MODULES])
         return {"response": "Catálogo do projeto atualizado!", "data": project_data}
     
     except Exception as e:
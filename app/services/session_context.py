@@ -0,0 +1,120 @@
+# app/services/session_context.py
+
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from app.core.cache import get_redis_cache
+
+# Configuração de logs
+logger = logging.getLogger("session_context")
+logger.setLevel(logging.INFO)
+
+# Configuração do contexto das sessões de chat
+CHAT_CONTEXT_MAX_TURNS = int(os.getenv("CHAT_CONTEXT_MAX_TURNS", 20))  # Turnos (mensagem + resposta) por sessão
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", 2000))  # Tokens estimados enviados ao modelo
+CHAT_SESSION_TTL = int(os.getenv("CHAT_SESSION_TTL", 1800))  # Segundos de inatividade até a sessão expirar
+
+_KEY_PREFIX = "chat:session:"
+_CHARS_PER_TOKEN = 4  # Estimativa aproximada para texto em português
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+class SessionContextStore:
+    """
+    Contexto recente de cada sessão de chat em uma lista Redis limitada.
+    Cada turno é anexado com RPUSH e a lista é cortada com LTRIM para os últimos
+    `max_turns` turnos, então ler e gravar custa o mesmo qualquer que seja o tamanho
+    do histórico no MongoDB. A sessão expira após `ttl` segundos sem uso.
+    """
+
+    def __init__(self, max_turns: int = CHAT_CONTEXT_MAX_TURNS, token_budget: int = CHAT_CONTEXT_TOKEN_BUDGET, ttl: int = CHAT_SESSION_TTL):
+        self.max_entries = max(1, max_turns) * 2  # Uma entrada para o Admin e outra para o assistente
+        self.token_budget = token_budget
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"{_KEY_PREFIX}{session_id}"
+
+    async def append_turn(self, session_id: str, user_message: str, assistant_message: str):
+        """
+        Anexa um turno ao contexto da sessão, descarta os mais antigos e renova a expiração.
+        """
+        now = time.time()
+        entries = [
+            json.dumps({"role": "user", "content": user_message, "ts": now}, ensure_ascii=False),
+            json.dumps({"role": "assistant", "content": assistant_message, "ts": now}, ensure_ascii=False),
+        ]
+        key = self._key(session_id)
+        try:
+            redis_cache = await get_redis_cache()
+            async with redis_cache.redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(key, *entries)
+                pipe.ltrim(key, -self.max_entries, -1)
+                pipe.expire(key, self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar contexto da sessão {session_id}: {str(e)}")
+
+    async def get_context(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        Retorna as mensagens mais recentes da sessão (formato `role`/`content`), em ordem
+        cronológica e limitadas ao orçamento de tokens.
+        """
+        key = self._key(session_id)
+        try:
+            redis_cache = await get_redis_cache()
+            async with redis_cache.redis.pipeline(transaction=False) as pipe:
+                pipe.lrange(key, -self.max_entries, -1)
+                pipe.expire(key, self.ttl)
+                entries, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Contexto da sessão {session_id} indisponível: {str(e)}")
+            return []
+
+        # Mantém as mensagens mais novas que couberem no orçamento
+        context, tokens = [], 0
+        for raw in reversed(entries):
+            entry = json.loads(raw)
+            tokens += estimate_tokens(entry["content"])
+            if tokens > self.token_budget:
+                break
+            context.append({"role": entry["role"], "content": entry["content"]})
+        context.reverse()
+
+        # Não começa o contexto com uma resposta sem a pergunta correspondente
+        if context and context[0]["role"] == "assistant":
+            context.pop(0)
+        return context
+
+    async def clear(self, session_id: str):
+        """
+        Remove o contexto da sessão.
+        """
+        try:
+            redis_cache = await get_redis_cache()
+            await redis_cache.clear_cache(self._key(session_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao remover contexto da sessão {session_id}: {str(e)}")
+
+
+# Instância global do contexto das sessões
+session_context = SessionContextStore()
+
+def resolve_session_id(session_id: Optional[Any]) -> str:
+    """
+    Usa o `session_id` enviado pelo cliente ou inicia uma nova sessão.
+    """
+    if isinstance(session_id, str) and session_id.strip():
+        return session_id.strip()[:64]
+    return new_session_id()
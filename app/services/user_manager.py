@@ -3,6 +3,7 @@
 from datetime import datetime
 from app.core.database import get_database
 from app.core.security import hash_password, verify_password
+from app.services.counters import increment_counter
 from typing import Dict, Any
 from bson import ObjectId
 
@@ -12,7 +13,7 @@ async def create_user(username: str, email: str, password: str, role: str = "use
     """
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password(password)
     user_data = {
         "username": username,
         "email": email,
@@ -23,6 +24,7 @@ async def create_user(username: str, email: str, password: str, role: str = "use
     }
 
     await db["users"].insert_one(user_data)
+    await increment_counter("users")
     return {"message": f"Usuário '{username}' criado com sucesso!", "user": user_data}
 
 async def authenticate_user(email: str, password: str) -> Dict[str, Any]:
@@ -32,7 +34,7 @@ async def authenticate_user(email: str, password: str) -> Dict[str, Any]:
     db = await get_database()  # 🔹 Correção: Adicionado `await get_database()`
     
     user = await db["users"].find_one({"email": email})
-    if not user or not verify_password(password, user["hashed_password"]):
+    if not user or not await verify_password(password, user["hashed_password"]):
         return {"error": "Credenciais inválidas."}
 
     return {
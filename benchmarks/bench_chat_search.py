@@ -0,0 +1,78 @@
+# benchmarks/bench_chat_search.py
+#
+# Mede a busca BM25 do histórico do chat sobre segmentos sintéticos em disco, comparando a
+# avaliação completa de todos os postings com a padrão (limite por termo e parada antecipada),
+# e a concordância entre os dois top-k.
+#
+# Uso: python benchmarks/bench_chat_search.py [--segments 20] [--docs 20000] [--limit 20]
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O pacote `app` valida estas variáveis ao ser importado; o benchmark não conecta a nenhum serviço
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URI", "redis://localhost:6379")
+
+from bson import ObjectId  # noqa: E402
+from app.services.chat_search import ChatSearchIndex, DiskSegment, MemorySegment, tokenize  # noqa: E402
+
+COMMON = ["erro", "modulo", "usuario", "sistema", "deploy", "painel", "relatorio", "api"]
+QUERIES = ["erro modulo", "erro no deploy do painel", "relatorio de usuario", "api sistema lenta", "painel"]
+
+
+def build_index(directory: str, segments: int, docs: int) -> ChatSearchIndex:
+    """
+    Grava `segments` segmentos de `docs` turnos: vocabulário raro aleatório e termos comuns
+    presentes em boa parte dos turnos, como no histórico real.
+    """
+    rare = [f"termo{index}" for index in range(50000)]
+    index = ChatSearchIndex(directory)
+    for number in range(segments):
+        segment = MemorySegment()
+        for _ in range(docs):
+            words = random.sample(COMMON, random.randint(1, 4)) + random.choices(rare, k=random.randint(5, 40))
+            segment.add(ObjectId(), time.time(), tokenize(" ".join(words)))
+        meta = DiskSegment.write(directory, f"seg-{number}", segment)
+        index.segments.append(DiskSegment(directory, meta["name"], meta["doc_count"], meta["total_length"]))
+    return index
+
+
+def timed(index: ChatSearchIndex, query: str, limit: int, exhaustive: bool, repeat: int = 3):
+    samples, hits = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hits = index.search(query, limit, exhaustive=exhaustive)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), {object_id for object_id, _, _ in hits}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        index = build_index(directory, args.segments, args.docs)
+        print(f"Índice: {index.doc_count} turnos em {len(index.segments)} segmentos ({time.perf_counter() - started:.1f}s)")
+        print(f"{'consulta':<28}{'completa (ms)':>15}{'padrão (ms)':>14}{'top-k igual':>13}")
+        for query in QUERIES:
+            full_ms, full_hits = timed(index, query, args.limit, True)
+            fast_ms, fast_hits = timed(index, query, args.limit, False)
+            overlap = len(full_hits & fast_hits) / max(len(full_hits), 1)
+            print(f"{query:<28}{full_ms:>15.1f}{fast_ms:>14.1f}{overlap:>12.0%}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
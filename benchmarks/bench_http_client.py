@@ -0,0 +1,96 @@
+# benchmarks/bench_http_client.py
+#
+# Sobe um servidor HTTP local que simula a latência de uma API externa e compara
+# chamadas concorrentes feitas pelo cliente compartilhado com chamadas bloqueantes
+# executadas dentro de corrotinas (comportamento anterior com `requests`).
+#
+# Uso: python benchmarks/bench_http_client.py [--calls 20] [--latency 0.2]
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O pacote `app` valida estas variáveis ao ser importado; o benchmark não conecta a nenhum serviço
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URI", "redis://localhost:6379")
+
+from app.core.http_client import HTTPClient  # noqa: E402
+
+
+def start_stand_in_server(latency: float) -> ThreadingHTTPServer:
+    """
+    Servidor local que responde como uma API externa lenta.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128  # Evita recusar conexões simultâneas no backlog padrão (5)
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def blocking_calls(url: str, calls: int) -> float:
+    async def call():
+        request = urllib.request.Request(url, data=b"{}", method="POST")
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return time.perf_counter() - started
+
+
+async def pooled_calls(url: str, calls: int) -> float:
+    client = HTTPClient()
+    await client.start()
+    try:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.post(url, json={}) for _ in range(calls)))
+        assert all(response.status_code == 200 for response in responses)
+        return time.perf_counter() - started
+    finally:
+        await client.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = start_stand_in_server(args.latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    print(f"{args.calls} chamadas concorrentes, latência do servidor {args.latency * 1000:.0f} ms")
+    print(f"{'bloqueante no event loop':<28}{await blocking_calls(url, args.calls):>8.2f} s")
+    print(f"{'cliente assíncrono em pool':<28}{await pooled_calls(url, args.calls):>8.2f} s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
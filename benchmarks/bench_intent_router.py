@@ -0,0 +1,86 @@
+# benchmarks/bench_intent_router.py
+#
+# Compara o roteador de intenções compilado (Aho-Corasick) com a cadeia de testes
+# `frase in mensagem` usada anteriormente, variando o tamanho do catálogo.
+#
+# Uso: python benchmarks/bench_intent_router.py [--messages 2000] [--sizes 2,50,500]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O pacote `app` valida estas variáveis ao ser importado; o benchmark não conecta a nenhum serviço
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URI", "redis://localhost:6379")
+
+from app.services.intent_router import INTENTS, IntentRouter  # noqa: E402
+
+WORDS = ["sistema", "relatório", "usuário", "painel", "módulo", "dados", "integração", "api", "log", "deploy"]
+
+
+def build_catalogue(size: int):
+    """
+    Catálogo com as intenções reais seguidas de intenções sintéticas.
+    """
+    catalogue = list(INTENTS)
+    for index in range(size):
+        phrases = [f"acao{index} {word}" for word in random.sample(WORDS, 3)]
+        catalogue.append({"intent": f"synthetic_{index}", "phrases": phrases, "slots": []})
+    return catalogue
+
+
+def naive_match(catalogue, message: str):
+    lowered = message.lower()
+    for intent in catalogue:
+        for phrase in intent["phrases"]:
+            if phrase in lowered:
+                return intent["intent"]
+    return None
+
+
+def build_messages(count: int):
+    templates = [
+        "Por favor, criar módulo {w} para o time",
+        "Você pode otimizar o sistema hoje?",
+        "Quais são os {w} mais recentes do painel de {w}?",
+        "Preciso de ajuda com {w} e {w} no ambiente de produção, obrigado",
+    ]
+    return [random.choice(templates).format(w=random.choice(WORDS)) for _ in range(count)]
+
+
+def measure(function, messages) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        function(message)
+    return (time.perf_counter() - started) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--sizes", default="0,50,500")
+    args = parser.parse_args()
+
+    random.seed(42)
+    messages = build_messages(args.messages)
+
+    print(f"{'intenções':>10} {'frases':>8} {'ingênuo µs':>12} {'compilado µs':>13} {'compilação ms':>14}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        catalogue = build_catalogue(size)
+        phrases = sum(len(intent["phrases"]) for intent in catalogue)
+
+        started = time.perf_counter()
+        router = IntentRouter(catalogue)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        naive_us = measure(lambda message: naive_match(catalogue, message), messages)
+        compiled_us = measure(router.match, messages)
+        print(f"{len(catalogue):>10} {phrases:>8} {naive_us:>12.2f} {compiled_us:>13.2f} {compile_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_request_timing.py
+#
+# Mede o custo por requisição do RequestTimingMiddleware chamando uma aplicação FastAPI
+# diretamente pela interface ASGI (sem servidor nem rede), com e sem o middleware.
+# O buffer de `api_logs` não é descarregado durante a medição: nada é gravado no MongoDB.
+#
+# Uso: python benchmarks/bench_request_timing.py [--requests 20000] [--sample-rate 1.0]
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# O pacote `app` valida estas variáveis ao ser importado; o benchmark não conecta a nenhum serviço
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URI", "redis://localhost:6379")
+
+from fastapi import FastAPI  # noqa: E402
+from app.core.batch_writer import BatchWriter  # noqa: E402
+from app.core.request_timing import RequestTimingMiddleware  # noqa: E402
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/modules/{module_name}")
+    async def get_module(module_name: str):
+        return {"module": module_name, "status": "active"}
+
+    return app
+
+
+async def drive(asgi_app, requests: int) -> float:
+    """
+    Executa `requests` GETs pela interface ASGI e retorna o tempo médio por requisição (µs).
+    """
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int):
+        return {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/modules/mod{i % 100}", "raw_path": f"/modules/mod{i % 100}".encode(),
+            "root_path": "", "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+        }
+
+    for i in range(200):  # Aquecimento
+        await asgi_app(scope(i), receive, send)
+
+    started = time.perf_counter()
+    for i in range(requests):
+        await asgi_app(scope(i), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main(requests: int, sample_rate: float):
+    bare = build_app()
+    sink = BatchWriter("api_logs", batch_size=requests * 2, flush_interval=3600, max_buffer=requests * 2)
+    timed = RequestTimingMiddleware(build_app(), sample_rate=sample_rate, sink=sink)
+
+    bare_us = await drive(bare, requests)
+    timed_us = await drive(timed, requests)
+    print(f"{'sem middleware':>16}: {bare_us:8.1f} µs/req")
+    print(f"{'com middleware':>16}: {timed_us:8.1f} µs/req  (+{timed_us - bare_us:.1f} µs, amostragem {sample_rate})")
+    print(f"{'descartados':>16}: {sink.stats()['dropped']}")
+
+    if sink._task is not None:
+        sink._task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.sample_rate))
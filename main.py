@@ -1,6 +1,20 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from app.routes import users, modules, admin, deploy, logs, frontend_sync  # <-- Certifique-se de importar todas as rotas!
 from app.core.database import database
+from app.core.schema import bootstrap_schema
+from app.core.hashing import password_hasher
+from app.core.http_client import http_client
+from app.core.redis_pool import redis_pool
+from app.services.logging_service import start_log_sink, stop_log_sink
+from app.services.chat_transcript import start_transcript_writer, stop_transcript_writer
+from app.services.chat_search import start_chat_search, stop_chat_search
+from app.services.counters import collection_counters
+from app.core.metrics import CONTENT_TYPE_LATEST, registry
+from app.core.response_cache import ResponseCacheMiddleware
+from app.core.request_timing import RequestTimingMiddleware, start_request_logging, stop_request_logging
+from app.services.latency_sketches import start_latency_sketches, stop_latency_sketches
+from app.services.hot_routes import hot_routes
 from config.settings import settings
 
 import logging
@@ -17,6 +31,12 @@ app = FastAPI(
     description="Chat Central - Assistente Inteligente para Gestão de Projetos e Módulos"
 )
 
+# Serve do Redis as respostas GET das rotas com cache ativado por `apply_cache_optimization`
+app.add_middleware(ResponseCacheMiddleware, router=app.router)
+# Mede todas as requisições e alimenta `api_logs` (lido pelo performance_tuner); o último
+# middleware adicionado é o mais externo, então respostas servidas do cache também são medidas
+app.add_middleware(RequestTimingMiddleware)
+
 # Conectar ao banco de dados ao iniciar a aplicação
 @app.on_event("startup")
 async def startup_event():
@@ -26,12 +46,42 @@ async def startup_event():
         logger.info("✅ Conexão com o banco de dados estabelecida com sucesso!")
     except Exception as e:
         logger.error(f"❌ Erro ao conectar ao banco de dados: {e}")
+        return
+
+    # Criar índices declarados e reportar divergências de schema
+    try:
+        await bootstrap_schema(database.db)
+    except Exception as e:
+        logger.error(f"❌ Erro ao preparar índices do banco de dados: {e}")
+
+    await redis_pool.start()  # Health check periódico do Redis
+
+    # Iniciar gravação em lote dos logs e do histórico do chat e o pool HTTP das integrações
+    await start_log_sink()
+    await start_request_logging()
+    await start_latency_sketches()
+    await hot_routes.start()
+    await start_transcript_writer()
+    await start_chat_search()
+    await collection_counters.start()
+    await http_client.start()
 
 # Fechar conexões ao desligar a API
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.warning("⚠️ Encerrando conexões do banco de dados...")
-    await database.client.close()
+    await collection_counters.stop()
+    await stop_log_sink()  # Grava os logs pendentes antes de fechar o MongoDB
+    await stop_request_logging()
+    await stop_latency_sketches()
+    await hot_routes.stop()
+    await stop_transcript_writer()
+    await stop_chat_search()  # Depois do histórico, para indexar os últimos turnos
+    await http_client.close()
+    password_hasher.shutdown()
+    await redis_pool.close()  # Depois de todos os serviços que gravam no Redis
+    if database.client:
+        database.client.close()
 
 # 📌 🔹 Agora incluindo TODAS as rotas corretamente!
 app.include_router(users.router, prefix="/users", tags=["Usuários"])
@@ -54,6 +104,14 @@ async def health_check():
         "database": "✅ Conectado" if database.client else "❌ Erro na conexão"
     }
 
+# Métricas do processo no formato do Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Expõe latência por rota, MongoDB, Redis, bcrypt, JWT e cache para o Prometheus.
+    """
+    return Response(registry.render(), media_type=CONTENT_TYPE_LATEST)
+
 # Rodar a API com Uvicorn
 if __name__ == "__main__":
     import uvicorn